@@ -0,0 +1,296 @@
+"""
+Build benchmark for the PHP domain.
+
+Generates a synthetic PHP API reference and times the read, resolve and
+write phases of a Sphinx build with ``sphinxcontrib.phpdomain`` loaded.
+Each build runs in a fresh interpreter so peak RSS is measured per build.
+The size of ``environment.pickle`` and of the pickled PHP objects alone are
+reported too; ``--namespaces 20 --classes 50 --members 20`` builds a
+reference of about 40,000 objects to measure them at scale.
+
+The corpus has ``--namespaces`` namespaces holding ``--classes`` classes
+each. Every class page documents ``--members`` methods and as many
+properties, and links to ``--refs`` random objects of other pages.
+
+Usage::
+
+    python bench/bench_build.py --namespaces 20 --classes 20 --save before
+    # ... change the domain ...
+    python bench/bench_build.py --namespaces 20 --classes 20 --compare before
+
+Only the standard library and Sphinx are needed; MyST corpora
+(``--format md``) also need ``myst-parser``.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+METRICS = (
+    "read",
+    "resolve",
+    "write",
+    "total",
+    "peak_rss_mb",
+    "env_pickle_kb",
+    "objects_pickle_kb",
+    "objects_per_sec",
+)
+
+
+def generate(srcdir, namespaces, classes, members, refs, fmt="rst", seed=0):
+    """
+    Write a synthetic corpus to srcdir, returns the number of PHP objects.
+    """
+    rng = random.Random(seed)
+    pages = []
+    targets = []
+    for n in range(namespaces):
+        namespace = f"Vendor\\Package{n}\\Sub"
+        for c in range(classes):
+            classname = f"Class{c}"
+            fullname = f"{namespace}\\{classname}"
+            pages.append((f"ns{n}_class{c}", namespace, classname))
+            targets.append(("class", fullname))
+            for m in range(members):
+                targets.append(("meth", f"{fullname}::method{m}"))
+                targets.append(("attr", f"{fullname}::$property{m}"))
+
+    os.makedirs(srcdir, exist_ok=True)
+    extensions = ["sphinxcontrib.phpdomain"]
+    if fmt == "md":
+        extensions.append("myst_parser")
+    with open(os.path.join(srcdir, "conf.py"), "w") as fp:
+        fp.write(f"extensions = {extensions!r}\n")
+        parser = "markdown" if fmt == "md" else "restructuredtext"
+        fp.write(f"source_suffix = {{'.{fmt}': '{parser}'}}\n")
+        fp.write("master_doc = 'index'\n")
+        fp.write("myst_enable_extensions = ['colon_fence']\n")
+
+    write_page = _write_md if fmt == "md" else _write_rst
+    with open(os.path.join(srcdir, "index." + fmt), "w") as fp:
+        if fmt == "md":
+            fp.write("# API\n\n```{toctree}\n:maxdepth: 1\n\n")
+            fp.write("\n".join(page[0] for page in pages))
+            fp.write("\n```\n")
+        else:
+            fp.write("API\n###\n\n.. toctree::\n   :maxdepth: 1\n\n")
+            fp.write("".join(f"   {page[0]}\n" for page in pages))
+
+    for docname, namespace, classname in pages:
+        links = [rng.choice(targets) for _ in range(refs)]
+        with open(os.path.join(srcdir, docname + "." + fmt), "w") as fp:
+            write_page(fp, namespace, classname, members, links)
+
+    return len(targets)
+
+
+def _write_rst(fp, namespace, classname, members, links):
+    title = f"{namespace}\\{classname}"
+    fp.write(f"{title}\n{'#' * len(title)}\n\n")
+    fp.write(f".. php:namespace:: {namespace}\n\n")
+    fp.write(f".. php:class:: {classname}\n\n   A synthetic class.\n\n")
+    for m in range(members):
+        fp.write(f"   .. php:method:: method{m}($first, $second[, $third])\n\n")
+        fp.write("      A synthetic method.\n\n")
+        fp.write("      :param string $first: The first argument.\n")
+        fp.write("      :param int $second: The second argument.\n")
+        fp.write("      :returns: Nothing.\n\n")
+        fp.write(f"   .. php:attr:: property{m}\n\n      A synthetic property.\n\n")
+    fp.write("References\n==========\n\n")
+    for role, target in links:
+        fp.write(f"- :php:{role}:`{target.replace(chr(92), chr(92) * 2)}`\n")
+
+
+def _write_md(fp, namespace, classname, members, links):
+    fp.write(f"# {namespace}\\{classname}\n\n")
+    fp.write(f":::{{php:namespace}} {namespace}\n:::\n\n")
+    fp.write(f":::{{php:class}} {classname}\nA synthetic class.\n:::\n\n")
+    for m in range(members):
+        fp.write(f":::{{php:method}} method{m}($first, $second[, $third])\n")
+        fp.write("A synthetic method.\n\n")
+        fp.write(":param string $first: The first argument.\n")
+        fp.write(":param int $second: The second argument.\n")
+        fp.write(":returns: Nothing.\n:::\n\n")
+        fp.write(f":::{{php:attr}} property{m}\nA synthetic property.\n:::\n\n")
+    fp.write("## References\n\n")
+    for role, target in links:
+        fp.write(f"- {{php:{role}}}`{target}`\n")
+
+
+def run_build(srcdir, outdir, builder="html", jobs=1):
+    """
+    Build srcdir in this process and return the phase timings.
+    """
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
+    timings = {"resolve": 0.0}
+    get_and_resolve_doctree = BuildEnvironment.get_and_resolve_doctree
+
+    def timed_resolve(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return get_and_resolve_doctree(self, *args, **kwargs)
+        finally:
+            timings["resolve"] += time.perf_counter() - start
+
+    BuildEnvironment.get_and_resolve_doctree = timed_resolve
+
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        outdir,
+        os.path.join(outdir, ".doctrees"),
+        builder,
+        status=None,
+        warning=sys.stderr,
+        freshenv=True,
+        parallel=jobs,
+    )
+    marks = {}
+
+    def mark(name):
+        # env-updated handlers may return docnames to re-read, so return None
+        def handler(*args):
+            marks.setdefault(name, time.perf_counter())
+
+        return handler
+
+    app.connect("env-updated", mark("read"))
+    app.connect("build-finished", mark("end"))
+
+    start = time.perf_counter()
+    app.build()
+    end = marks.get("end", time.perf_counter())
+    read_end = marks.get("read", end)
+
+    objects = app.env.domaindata["php"]["objects"]
+    objects_pickle = len(pickle.dumps(objects, pickle.HIGHEST_PROTOCOL))
+    objects = len(objects)
+    total = end - start
+    return {
+        "read": read_end - start,
+        "resolve": timings["resolve"],
+        "write": end - read_end - timings["resolve"],
+        "total": total,
+        "peak_rss_mb": max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        / 1024,
+        "env_pickle_kb": os.path.getsize(
+            os.path.join(app.doctreedir, "environment.pickle")
+        )
+        / 1024,
+        "objects_pickle_kb": objects_pickle / 1024,
+        "objects": objects,
+        "objects_per_sec": objects / total if total else 0.0,
+    }
+
+
+def measure(srcdir, builder, jobs):
+    """
+    Run one build in a child interpreter, returns its timings.
+    """
+    outdir = tempfile.mkdtemp(prefix="phpdomain-bench-out-")
+    try:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--_build", srcdir, outdir]
+            + ["--builder", builder, "--jobs", str(jobs)],
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        ).stdout
+    finally:
+        shutil.rmtree(outdir, ignore_errors=True)
+    return json.loads(output.splitlines()[-1])
+
+
+def report(result, baseline=None):
+    for metric in METRICS:
+        value = result[metric]
+        line = f"  {metric:16} {value:12.3f}"
+        if baseline and baseline.get(metric):
+            change = (value - baseline[metric]) / baseline[metric] * 100
+            line += f"   {baseline[metric]:12.3f}  {change:+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--namespaces", type=int, default=10)
+    parser.add_argument("--classes", type=int, default=10)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--refs", type=int, default=20)
+    parser.add_argument("--format", choices=("rst", "md"), default="rst")
+    parser.add_argument("--builder", default="html")
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="NAME", help="save the result as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare with a baseline")
+    parser.add_argument("--_build", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._build:
+        result = run_build(*args._build, builder=args.builder, jobs=args.jobs)
+        print(json.dumps(result))
+        return
+
+    srcdir = tempfile.mkdtemp(prefix="phpdomain-bench-src-")
+    try:
+        objects = generate(
+            srcdir,
+            args.namespaces,
+            args.classes,
+            args.members,
+            args.refs,
+            args.format,
+            args.seed,
+        )
+        print(f"{objects} objects in {args.namespaces * args.classes} pages")
+        results = [measure(srcdir, args.builder, args.jobs) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(srcdir, ignore_errors=True)
+    result = min(results, key=lambda result: result["total"])
+    result["params"] = {
+        key: getattr(args, key)
+        for key in (
+            "namespaces",
+            "classes",
+            "members",
+            "refs",
+            "format",
+            "builder",
+            "jobs",
+        )
+    }
+
+    baseline = None
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, args.compare + ".json")) as fp:
+            baseline = json.load(fp)
+        if baseline.get("params") != result["params"]:
+            print(f"warning: baseline {args.compare} used {baseline.get('params')}")
+    report(result, baseline)
+
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(os.path.join(BASELINE_DIR, args.save + ".json"), "w") as fp:
+            json.dump(result, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of php:members against individual member directives.
+
+Generates two copies of a synthetic API reference, one declaring every
+member with its own ``php:method``, ``php:attr`` and ``php:const``
+directive and one listing the same members in a ``php:members`` table, and
+times a build of each with :mod:`bench_build`. Both copies produce the same
+objects, anchors and index entries.
+
+Usage::
+
+    python bench/bench_members.py --classes 20 --members 200
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from bench_build import measure, report
+
+KINDS = (
+    ("method", "method{0}($first, $second = null) -> string"),
+    ("attr", "protected property{0}"),
+    ("const", "CONSTANT_{0}"),
+)
+
+
+def generate(srcdir, classes, members, table):
+    """
+    Write a corpus of classes with members of each kind to srcdir.
+    """
+    os.makedirs(srcdir, exist_ok=True)
+    with open(os.path.join(srcdir, "conf.py"), "w") as fp:
+        fp.write("extensions = ['sphinxcontrib.phpdomain']\n")
+        fp.write("master_doc = 'index'\n")
+    with open(os.path.join(srcdir, "index.rst"), "w") as fp:
+        fp.write("API\n###\n\n.. toctree::\n   :maxdepth: 1\n\n")
+        fp.write("".join(f"   class{c}\n" for c in range(classes)))
+    for c in range(classes):
+        with open(os.path.join(srcdir, f"class{c}.rst"), "w") as fp:
+            fp.write(f"Class{c}\n{'#' * len(f'Class{c}')}\n\n")
+            fp.write(".. php:namespace:: Vendor\\Package\n\n")
+            fp.write(f".. php:class:: Class{c}\n\n")
+            if table:
+                fp.write("   .. php:members::\n\n")
+            for m in range(members):
+                kind, signature = KINDS[m % len(KINDS)]
+                signature = signature.format(m)
+                if table:
+                    fp.write(f"      {kind} {signature}\n")
+                    fp.write(f"         A synthetic {kind}.\n")
+                else:
+                    fp.write(f"   .. php:{kind}:: {signature}\n\n")
+                    fp.write(f"      A synthetic {kind}.\n\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--builder", default="html")
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest run")
+    args = parser.parse_args()
+
+    results = {}
+    for name, table in (("directives", False), ("php:members", True)):
+        srcdir = tempfile.mkdtemp(prefix="phpdomain-bench-src-")
+        try:
+            generate(srcdir, args.classes, args.members, table)
+            runs = [measure(srcdir, args.builder, 1) for _ in range(args.repeat)]
+        finally:
+            shutil.rmtree(srcdir, ignore_errors=True)
+        results[name] = min(runs, key=lambda result: result["total"])
+
+    print(f"{args.classes * args.members} members in {args.classes} pages")
+    print("directives:")
+    report(results["directives"])
+    print("php:members, compared with directives:")
+    report(results["php:members"], results["directives"])
+
+
+if __name__ == "__main__":
+    main()
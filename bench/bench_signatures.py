@@ -0,0 +1,135 @@
+"""
+Microbenchmark for the PHP signature parser.
+
+Times parsing a corpus of real PHP signatures (mostly taken from the PHP
+manual) into signature nodes, once with empty parser caches and once with
+warm caches, which is what repeated signatures across classes and
+versioned copies of the same API hit.
+
+Usage::
+
+    python bench/bench_signatures.py [--repeat N] [--copies N]
+"""
+
+import argparse
+import time
+
+from sphinx import addnodes
+
+from sphinxcontrib.phpdomain import parse_arglist, parse_signature, _add_params
+
+CORPUS = [
+    "DateTime::__construct(string $datetime = 'now', ?DateTimeZone $timezone = null)",
+    "DateTime::add(DateInterval $interval) -> DateTime",
+    "DateTime::createFromFormat(string $format, string $datetime[, ?DateTimeZone $timezone = null]) -> DateTime|false",
+    "DateTime::format(string $format) -> string",
+    "DateTime::modify(string $modifier) -> DateTime|false",
+    "DateTime::setDate(int $year, int $month, int $day) -> DateTime",
+    "DateTime::setISODate(int $year, int $week[, int $dayOfWeek = 1]) -> DateTime",
+    "DateTime::setTime(int $hour, int $minute[, int $second = 0[, int $microsecond = 0]]) -> DateTime",
+    "DateTime::setTimestamp(int $timestamp) -> DateTime",
+    "DateTime::sub(DateInterval $interval) -> DateTime",
+    "public static getLastErrors() -> array|false",
+    "ArrayObject::__construct(array|object $array = [], int $flags = 0, string $iteratorClass = ArrayIterator::class)",
+    "ArrayObject::offsetGet(mixed $key) -> mixed",
+    "ArrayObject::offsetSet(mixed $key, mixed $value) -> void",
+    "ArrayObject::uasort(callable $callback) -> bool",
+    "PDO::__construct(string $dsn[, ?string $username = null[, ?string $password = null[, ?array $options = null]]])",
+    "PDO::prepare(string $query, array $options = []) -> PDOStatement|false",
+    "PDO::query(string $query, ?int $fetchMode = null) -> PDOStatement|false",
+    "PDOStatement::bindParam(string|int $param, mixed &$var, int $type = PDO::PARAM_STR, int $maxLength = 0, mixed $driverOptions = null) -> bool",
+    "PDOStatement::fetch(int $mode = PDO::FETCH_DEFAULT, int $cursorOrientation = PDO::FETCH_ORI_NEXT, int $cursorOffset = 0) -> mixed",
+    "PDOStatement::fetchAll(int $mode = PDO::FETCH_DEFAULT, mixed ...$args) -> array",
+    "SplObjectStorage::attach(object $object, mixed $info = null) -> void",
+    "SplPriorityQueue::insert(mixed $value, mixed $priority)",
+    "Closure::bind(Closure $closure, ?object $newThis, object|string|null $newScope = 'static') -> ?Closure",
+    "Closure::fromCallable(callable $callback) -> Closure",
+    "ReflectionClass::getMethods(?int $filter = null) -> array",
+    "ReflectionClass::newInstanceArgs(array $args = []) -> ?object",
+    "ReflectionMethod::invoke(?object $object, mixed ...$args) -> mixed",
+    "array_map(?callable $callback, array $array, array ...$arrays) -> array",
+    "array_filter(array $array, ?callable $callback = null, int $mode = 0) -> array",
+    "array_slice(array $array, int $offset, ?int $length = null, bool $preserve_keys = false) -> array",
+    "array_splice(array &$array, int $offset, ?int $length = null, mixed $replacement = []) -> array",
+    "in_array(mixed $needle, array $haystack, bool $strict = false) -> bool",
+    "json_decode(string $json, ?bool $associative = null, int $depth = 512, int $flags = 0) -> mixed",
+    "json_encode(mixed $value, int $flags = 0, int $depth = 512) -> string|false",
+    "preg_match(string $pattern, string $subject, array &$matches = null, int $flags = 0, int $offset = 0) -> int|false",
+    "preg_replace_callback(string|array $pattern, callable $callback, string|array $subject, int $limit = -1, int &$count = null, int $flags = 0) -> string|array|null",
+    "sprintf(string $format, mixed ...$values) -> string",
+    "str_replace(array|string $search, array|string $replace, string|array $subject, int &$count = null) -> string|array",
+    "strpos(string $haystack, string $needle, int $offset = 0) -> int|false",
+    "date_format($object, $format)",
+    "setDate($year, $month, $day)",
+    "setTime($hour, $minute[, $second])",
+    "instanceMethod($one, $two)",
+    "log($level, $string)",
+    "render($template)",
+    "color() -> string",
+    "values() -> string[]",
+    "Hearts : 'H'",
+    "Suit : string",
+    "ATOM",
+    "$property",
+]
+
+
+def build(sig):
+    """
+    Parse sig and build the nodes handle_signature would add for it.
+    """
+    parsed = parse_signature(sig)
+    signode = addnodes.desc_signature(sig, "")
+    if parsed.params:
+        paramlist = addnodes.desc_parameterlist()
+        _add_params(paramlist, parsed.params)
+        signode += paramlist
+    return signode
+
+
+def clear_caches():
+    parse_signature.cache_clear()
+    parse_arglist.cache_clear()
+
+
+def timed(func, corpus, repeat, cold):
+    best = None
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        for sig in corpus:
+            func(sig)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(corpus)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--copies",
+        type=int,
+        default=50,
+        help="how many times each signature appears, like inherited or "
+        "versioned copies of the same API",
+    )
+    args = parser.parse_args()
+
+    corpus = CORPUS * args.copies
+    print(f"{len(CORPUS)} distinct signatures, {len(corpus)} documented")
+    for label, func in (("parse", parse_signature), ("parse + nodes", build)):
+        cold = timed(func, CORPUS, args.repeat, cold=True)
+        warm = timed(func, corpus, args.repeat, cold=False)
+        print(f"  {label}:")
+        print(f"    cold:   {cold * 1e6:8.2f} us/signature")
+        print(f"    cached: {warm * 1e6:8.2f} us/signature")
+        print(
+            f"    corpus: {cold * len(corpus) * 1e3:8.2f} ms uncached, "
+            f"{(cold * len(CORPUS) + warm * len(corpus)) * 1e3:8.2f} ms cached"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Sphinx PHP domain.
+
+The domain lives in :mod:`sphinxcontrib.phpdomain.domain` and is only
+imported when Sphinx loads the extension or one of its names is used, so
+``python -m sphinxcontrib.phpdomain`` can query a symbol index without
+importing Sphinx.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import importlib
+
+
+def setup(app):
+    from .domain import setup
+
+    return setup(app)
+
+
+def __getattr__(name):
+    # the names of the domain and signature modules stay importable from the
+    # package
+    for module in (".domain", ".signature"):
+        module = importlib.import_module(module, __name__)
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
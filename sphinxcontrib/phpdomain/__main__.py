@@ -0,0 +1,13 @@
+"""
+Query the PHP symbol index of a built documentation, see
+:mod:`sphinxcontrib.phpdomain.symbols`.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import sys
+
+from .symbols import main
+
+sys.exit(main())
@@ -0,0 +1,878 @@
+"""
+Autodoc-style directives for the PHP domain.
+
+Reads declarations and docblocks from PHP source files with a pure Python
+tokenizer and emits the regular ``php:*`` directives for them. Parsed files
+are cached on disk so unchanged sources are not parsed again.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import re
+import json
+import hashlib
+
+from docutils import nodes
+from docutils.parsers.rst import directives, Directive
+from docutils.statemachine import StringList
+
+from sphinx.util.nodes import nested_parse_with_titles
+
+from .diagnostics import log_warning
+
+# bump when the parsed format changes to invalidate existing caches
+CACHE_VERSION = 1
+
+php_open_tag = re.compile(r"<\?(?:php\b|=)", re.I)
+
+php_token_re = re.compile(
+    r"""
+    (?P<doc>/\*\*.*?\*/)
+   |(?P<comment>/\*.*?\*/|(?://|\#(?!\[))[^\n]*?(?=\?>|\n|\Z))
+   |(?P<attribute>\#\[)
+   |(?P<heredoc><<<[ \t]*(?P<quote>["']?)(?P<label>[^\W\d]\w*)(?P=quote)\n
+        .*?\n[ \t]*(?P=label)\b)
+   |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`)
+   |(?P<variable>\$[^\W\d]\w*)
+   |(?P<name>\\?[^\W\d]\w*(?:\\[^\W\d]\w*)*)
+   |(?P<number>\d[\w.]*)
+   |(?P<close>\?>)
+   |(?P<whitespace>\s+)
+   |(?P<op>::|->|=>|\?->|\.\.\.|[-+*/%.&|^<>=!?]=?|.)
+    """,
+    re.S | re.X,
+)
+
+IGNORED_TOKENS = ("whitespace", "comment")
+VISIBILITIES = ("public", "protected", "private")
+MODIFIERS = ("abstract", "final", "static", "readonly", "var")
+CLASSLIKES = ("class", "interface", "trait", "enum")
+OPENING = {"(": ")", "[": "]", "{": "}"}
+
+
+def tokenize(source):
+    """
+    Yield (kind, text, start, end) for the PHP code in source.
+
+    Inline HTML outside of ``<?php ... ?>`` is skipped, as are whitespace
+    and comments other than docblocks.
+    """
+    pos = 0
+    length = len(source)
+    while pos < length:
+        m = php_open_tag.search(source, pos)
+        if m is None:
+            return
+        pos = m.end()
+        while pos < length:
+            m = php_token_re.match(source, pos)
+            kind = m.lastgroup
+            if kind in ("quote", "label"):
+                kind = "heredoc"
+            pos = m.end()
+            if kind == "close":
+                break
+            if kind not in IGNORED_TOKENS:
+                yield kind, m.group(), m.start(), pos
+
+
+class PhpParseError(ValueError):
+    """
+    Raised for PHP sources the parser cannot read, like truncated files.
+    """
+
+
+class PhpSourceParser:
+    """
+    Extract the declarations of a PHP file.
+
+    Declarations are plain dicts so they can be cached as JSON::
+
+        {"kind": "class", "namespace": "Foo", "name": "Bar",
+         "modifiers": ["abstract"], "extends": [...], "implements": [...],
+         "traits": [...], "type": None, "doc": "...", "members": [...]}
+
+    Functions, constants, methods, properties and enum cases carry "kind",
+    "name", "doc" and, where applicable, "visibility", "modifiers",
+    "params", "returns", "type" and "value".
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = tokenize(source)
+        self.pending = []
+        self.namespace = ""
+
+    def next(self):
+        if self.pending:
+            return self.pending.pop()
+        return next(self.tokens, None)
+
+    def push(self, token):
+        self.pending.append(token)
+
+    def text(self, start, end):
+        return " ".join(self.source[start:end].split())
+
+    def skip_balanced(self, closing):
+        """
+        Skip tokens up to and including closing, honouring nested brackets.
+        Returns the last token consumed.
+        """
+        stack = [closing]
+        while stack:
+            token = self.next()
+            if token is None:
+                return None
+            value = token[1]
+            if token[0] == "attribute":
+                stack.append("]")
+            elif value in OPENING and token[0] == "op":
+                stack.append(OPENING[value])
+            elif value == stack[-1] and token[0] == "op":
+                stack.pop()
+        return token
+
+    def expect_balanced(self, closing):
+        """
+        Like skip_balanced(), but closing must be found.
+        """
+        token = self.skip_balanced(closing)
+        if token is None:
+            raise PhpParseError("unexpected end of file, expected %r" % closing)
+        return token
+
+    def read_until(self, stops):
+        """
+        Consume an expression up to one of stops at bracket depth zero.
+        Returns (text, stop token); the stop token is pushed back.
+        """
+        start = end = None
+        while True:
+            token = self.next()
+            if token is None:
+                break
+            kind, value = token[:2]
+            if kind == "op" and value in stops:
+                self.push(token)
+                break
+            if start is None:
+                start = token[2]
+            if kind == "attribute":
+                end = self.expect_balanced("]")[3]
+            elif kind == "op" and value in OPENING:
+                end = self.expect_balanced(OPENING[value])[3]
+            else:
+                end = token[3]
+        if start is None:
+            return "", token
+        return self.text(start, end), token
+
+    def parse(self):
+        declarations = []
+        doc = None
+        modifiers = []
+        previous = None
+        while True:
+            token = self.next()
+            if token is None:
+                break
+            kind, value = token[:2]
+            keyword = value.lower() if kind == "name" else None
+            after_scope = previous is not None and previous[1] in ("::", "->", "?->")
+            previous = token
+            if kind == "doc":
+                doc = value
+                continue
+            if kind == "attribute":
+                self.skip_balanced("]")
+                continue
+            if keyword == "namespace" and not after_scope:
+                name = self.next()
+                if name is not None and name[0] == "name":
+                    self.namespace = name[1].lstrip("\\")
+                else:
+                    # a braced global namespace block
+                    self.namespace = ""
+                    if name is not None:
+                        self.push(name)
+            elif keyword in ("abstract", "final", "readonly") and not after_scope:
+                modifiers.append(keyword)
+                continue
+            elif keyword in CLASSLIKES and not after_scope:
+                decl = self.parse_classlike(keyword, doc, modifiers)
+                if decl:
+                    declarations.append(decl)
+            elif keyword == "function" and not after_scope:
+                decl = self.parse_function(doc, [])
+                if decl:
+                    decl["kind"] = "function"
+                    decl["namespace"] = self.namespace
+                    declarations.append(decl)
+            elif keyword == "const" and not after_scope:
+                for decl in self.parse_consts(doc, None, []):
+                    decl["namespace"] = self.namespace
+                    declarations.append(decl)
+            elif keyword == "use" and not after_scope:
+                self.read_until((";",))
+            elif kind == "op" and value == "{":
+                # blocks are transparent so declarations inside braced
+                # namespaces and conditional blocks are found
+                continue
+            doc = None
+            modifiers = []
+        return declarations
+
+    def parse_classlike(self, kind, doc, modifiers):
+        name = self.next()
+        if name is None or name[0] != "name":
+            # anonymous class, skip its arguments and body
+            if name is not None:
+                self.push(name)
+            self.read_until(("{",))
+            if self.next() is not None:
+                self.skip_balanced("}")
+            return None
+        decl = {
+            "kind": kind,
+            "namespace": self.namespace,
+            "name": name[1],
+            "modifiers": modifiers,
+            "extends": [],
+            "implements": [],
+            "traits": [],
+            "type": None,
+            "doc": doc,
+            "members": [],
+        }
+        # header up to the body
+        current = None
+        while True:
+            token = self.next()
+            if token is None:
+                return decl
+            kind, value = token[:2]
+            if kind == "op" and value == "{":
+                break
+            if kind == "op" and value == ":":
+                current = "type"
+            elif kind == "name" and value.lower() in ("extends", "implements"):
+                current = value.lower()
+            elif kind == "name" and current == "type":
+                decl["type"] = value
+            elif kind == "name" and current:
+                decl[current].append(value)
+        self.parse_members(decl)
+        return decl
+
+    def parse_members(self, decl):
+        members = decl["members"]
+        doc = None
+        visibility = None
+        modifiers = []
+        while True:
+            token = self.next()
+            if token is None or token[:2] == ("op", "}"):
+                return
+            kind, value = token[:2]
+            keyword = value.lower() if kind == "name" else None
+            if kind == "doc":
+                doc = value
+                continue
+            if kind == "attribute":
+                self.skip_balanced("]")
+                continue
+            if keyword in VISIBILITIES:
+                visibility = keyword
+                continue
+            if keyword in MODIFIERS:
+                if keyword != "var":
+                    modifiers.append(keyword)
+                continue
+            if keyword == "use":
+                while True:
+                    token = self.next()
+                    if token is None or token[1] == ";":
+                        break
+                    if token[1] == "{":
+                        self.skip_balanced("}")
+                        break
+                    if token[0] == "name":
+                        decl["traits"].append(token[1])
+            elif keyword == "case":
+                name = self.next()
+                if name is None:
+                    raise PhpParseError("unexpected end of file, expected a case")
+                value, _stop = self.read_until((";",))
+                self.next()
+                members.append(
+                    {
+                        "kind": "case",
+                        "name": name[1],
+                        "doc": doc,
+                        "value": value.lstrip("= ") or None,
+                    }
+                )
+            elif keyword == "const":
+                members.extend(self.parse_consts(doc, visibility, modifiers))
+            elif keyword == "function":
+                member = self.parse_function(doc, modifiers, decl)
+                if member:
+                    member["kind"] = "method"
+                    member["visibility"] = visibility or "public"
+                    members.append(member)
+            elif kind == "op" and value == ";":
+                pass
+            else:
+                self.push(token)
+                members.extend(self.parse_properties(doc, visibility, modifiers))
+            doc = None
+            visibility = None
+            modifiers = []
+
+    def parse_function(self, doc, modifiers, classdecl=None):
+        name = self.next()
+        if name is not None and name[1] == "&":
+            name = self.next()
+        if name is None or name[0] != "name":
+            # closure, skip its parameters, use list and body
+            if name is not None:
+                self.push(name)
+            self.read_until(("{", ";"))
+            token = self.next()
+            if token is not None and token[1] == "{":
+                self.skip_balanced("}")
+            return None
+        opening = self.next()
+        if opening is None or opening[1] != "(":
+            return None
+        params = []
+        while True:
+            param, stop = self.read_until((",", ")"))
+            self.next()
+            if param:
+                params.append(param)
+            if stop is None or stop[1] == ")":
+                break
+        returns = None
+        token = self.next()
+        if token is not None and token[1] == ":":
+            returns, token = self.read_until(("{", ";"))
+            token = self.next()
+        if token is not None and token[1] == "{":
+            self.skip_balanced("}")
+
+        params = [self.parse_param(param, classdecl) for param in params]
+        return {
+            "name": name[1],
+            "doc": doc,
+            "modifiers": modifiers,
+            "params": params,
+            "returns": returns or None,
+        }
+
+    def parse_param(self, param, classdecl):
+        """
+        Normalize a parameter, constructor promoted ones become properties.
+        """
+        param = re.sub(r"#\[.*?\]\s*", "", param)
+        words = param.split(" ")
+        promoted = []
+        while words and words[0].lower() in VISIBILITIES + ("readonly",):
+            promoted.append(words.pop(0).lower())
+        param = " ".join(words)
+        if promoted and classdecl is not None:
+            m = re.search(r"(.*?)\s*&?(?:\.\.\.)?\$(\w+)", param)
+            if m:
+                visibility = [word for word in promoted if word in VISIBILITIES]
+                classdecl["members"].append(
+                    {
+                        "kind": "property",
+                        "name": m.group(2),
+                        "doc": None,
+                        "visibility": visibility[0] if visibility else "public",
+                        "modifiers": [word for word in promoted if word == "readonly"],
+                        "type": m.group(1) or None,
+                        "value": None,
+                    }
+                )
+        return param
+
+    def parse_consts(self, doc, visibility, modifiers):
+        consts = []
+        while True:
+            names = []
+            while True:
+                token = self.next()
+                if token is None or token[1] in ("=", ";"):
+                    break
+                names.append(token[1])
+            if not names:
+                break
+            value, stop = self.read_until((",", ";"))
+            self.next()
+            consts.append(
+                {
+                    "kind": "const",
+                    "name": names[-1],
+                    "doc": doc,
+                    "visibility": visibility or "public",
+                    "modifiers": modifiers,
+                    "type": " ".join(names[:-1]) or None,
+                    "value": value or None,
+                }
+            )
+            if stop is None or stop[1] == ";":
+                break
+        return consts
+
+    def parse_properties(self, doc, visibility, modifiers):
+        properties = []
+        type_start = type_end = None
+        while True:
+            token = self.next()
+            if token is None or token[1] == ";":
+                break
+            if token[0] != "variable":
+                if token[1] == "{":
+                    # property hooks
+                    self.skip_balanced("}")
+                    break
+                if type_start is None:
+                    type_start = token[2]
+                type_end = token[3]
+                continue
+            value = None
+            nxt = self.next()
+            if nxt is not None and nxt[1] == "=":
+                value, nxt = self.read_until((",", ";", "{"))
+                nxt = self.next()
+            properties.append(
+                {
+                    "kind": "property",
+                    "name": token[1][1:],
+                    "doc": doc,
+                    "visibility": visibility or "public",
+                    "modifiers": modifiers,
+                    "type": self.text(type_start, type_end) if type_start else None,
+                    "value": value,
+                }
+            )
+            if nxt is None or nxt[1] == ";":
+                break
+            if nxt[1] == "{":
+                self.skip_balanced("}")
+                break
+        return properties
+
+
+def parse_source(source):
+    """
+    Return the declarations of the PHP source code.
+    """
+    return PhpSourceParser(source).parse()
+
+
+class PhpSourceCache:
+    """
+    On-disk cache of parsed PHP files.
+
+    Entries are keyed by the file path and validated by the modification
+    time, then by a hash of the content, so touched but unchanged files are
+    not parsed again either.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.memory = {}
+
+    def _entry_path(self, path):
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".json")
+
+    def _load(self, path):
+        entry = self.memory.get(path)
+        if entry is not None or not self.directory:
+            return entry
+        try:
+            with open(self._entry_path(path), encoding="utf-8") as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION or entry.get("path") != path:
+            return None
+        return entry
+
+    def _store(self, entry):
+        self.memory[entry["path"]] = entry
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        target = self._entry_path(entry["path"])
+        tmp = "%s.%d.tmp" % (target, os.getpid())
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(entry, fp)
+        os.replace(tmp, target)
+
+    def get(self, path):
+        """
+        Return the declarations of the PHP file at path.
+        """
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._load(path)
+        if entry is not None and entry["mtime"] == mtime:
+            return entry["declarations"]
+
+        with open(path, "rb") as fp:
+            content = fp.read()
+        digest = hashlib.sha1(content).hexdigest()
+        if entry is None or entry["hash"] != digest:
+            source = content.decode("utf-8", "replace")
+            try:
+                declarations = parse_source(source)
+            except PhpParseError as err:
+                raise PhpParseError("%s: %s" % (path, err)) from None
+            entry = {
+                "version": CACHE_VERSION,
+                "path": path,
+                "hash": digest,
+                "declarations": declarations,
+            }
+        entry["mtime"] = mtime
+        self._store(entry)
+        return entry["declarations"]
+
+
+_source_caches = {}
+
+
+def get_source_cache(env):
+    """
+    Return the source cache configured for env.
+    """
+    directory = env.config.php_autodoc_cache_dir
+    if directory is None:
+        directory = os.path.join(env.doctreedir, "php-autodoc")
+    elif directory:
+        directory = os.path.join(env.srcdir, directory)
+    cache = _source_caches.get(directory)
+    if cache is None:
+        cache = _source_caches[directory] = PhpSourceCache(directory)
+    return cache
+
+
+docblock_tag_re = re.compile(r"@(\w+)\s*(.*)", re.S)
+
+
+def _split_type(text):
+    """
+    Split a docblock type, which may contain spaces inside brackets as in
+    ``array<string, int>``, from the rest of text.
+    """
+    depth = 0
+    for i, char in enumerate(text):
+        if char in "<({[":
+            depth += 1
+        elif char in ">)}]":
+            depth -= 1
+        elif char.isspace() and depth <= 0:
+            return text[:i], text[i:].strip()
+    return text, ""
+
+
+def convert_docblock(doc):
+    """
+    Convert a docblock into reST lines, tags become domain fields.
+    Returns (lines, type given by @var).
+    """
+    if not doc:
+        return [], None
+    text = []
+    tags = []
+    for line in doc[3:-2].splitlines():
+        line = line.strip()
+        if line.startswith("*"):
+            line = line[1:]
+            if line.startswith(" "):
+                line = line[1:]
+        line = line.rstrip()
+        if line.lstrip().startswith("@"):
+            tags.append(line.strip())
+        elif tags:
+            # continuation of the previous tag
+            if line.strip():
+                tags[-1] += " " + line.strip()
+        else:
+            text.append(line)
+    while text and not text[0]:
+        text.pop(0)
+    while text and not text[-1]:
+        text.pop()
+
+    vartype = None
+    fields = []
+    for tag in tags:
+        m = docblock_tag_re.match(tag)
+        if not m:
+            continue
+        name, rest = m.group(1).lower(), m.group(2).strip()
+        typ, desc = _split_type(rest)
+        if name == "param" and rest:
+            if typ.startswith("$") or typ.startswith("..."):
+                fields.append(f":param {typ}: {desc}".rstrip())
+            else:
+                var, _sep, desc = desc.partition(" ")
+                fields.append(f":param {typ} {var}: {desc.strip()}".rstrip())
+        elif name == "var" and rest:
+            vartype = typ
+            if desc.startswith("$"):
+                desc = desc.partition(" ")[2].strip()
+            if desc:
+                text += ["", desc] if text else [desc]
+        elif name in ("return", "returns") and rest:
+            if desc:
+                fields.append(f":returns: {desc}")
+            fields.append(f":returntype: {typ}")
+        elif name in ("throws", "throw") and rest:
+            fields.append(f":throws {typ}: {desc}".rstrip())
+        elif name == "deprecated":
+            fields += ["", f".. deprecated:: {rest}".rstrip()]
+        elif name == "see" and rest:
+            fields += ["", f".. seealso:: {rest}"]
+
+    if text and fields and fields[0]:
+        text.append("")
+    return text + fields, vartype
+
+
+def _indent(lines):
+    return ["   " + line if line else "" for line in lines]
+
+
+def _simple(value):
+    """
+    Return value if it can be shown in a signature, otherwise "...".
+    """
+    if value and any(char in value for char in ",[]"):
+        return "..."
+    return value
+
+
+def _param(param):
+    name, sep, default = param.partition("=")
+    if sep:
+        return name.strip() + " = " + _simple(default.strip())
+    return param
+
+
+def classlike_lines(decl, options):
+    """
+    Return the reST directives describing a class-like declaration.
+    """
+    sig = decl["name"]
+    modifiers = [word for word in decl["modifiers"] if word in ("abstract", "final")]
+    if modifiers and decl["kind"] == "class":
+        sig = modifiers[0] + " " + sig
+    if decl["type"]:
+        sig += " : " + decl["type"]
+    lines = [f".. php:{decl['kind']}:: {sig}"]
+    for option, key in (
+        ("extends", "extends"),
+        ("implements", "implements"),
+        ("use", "traits"),
+    ):
+        if decl[key]:
+            lines.append(f"   :{option}: " + ", ".join(decl[key]))
+    lines.append("")
+    lines += _indent(convert_docblock(decl["doc"])[0])
+    lines.append("")
+    if "members" not in options:
+        return lines
+
+    for member in decl["members"]:
+        if member.get("visibility", "public") != "public" and (
+            "private-members" not in options
+        ):
+            continue
+        if not member["doc"] and "undoc-members" not in options:
+            continue
+        lines += _indent(member_lines(member))
+    return lines
+
+
+def member_lines(member):
+    kind = member["kind"]
+    visibility = member.get("visibility")
+    modifiers = member.get("modifiers", [])
+    if kind == "method":
+        directive = "staticmethod" if "static" in modifiers else "method"
+        prefix = visibility + " "
+        extra = [word for word in modifiers if word in ("abstract", "final")]
+        if extra and directive == "method":
+            prefix += extra[0] + " "
+        sig = prefix + function_signature(member)
+    elif kind == "property":
+        directive = "attr"
+        sig = member["name"]
+    elif kind == "case":
+        directive = "case"
+        sig = member["name"]
+        if member["value"]:
+            sig += " : " + member["value"]
+    else:
+        directive = "const"
+        sig = member["name"]
+        if member["value"] and _simple(member["value"]) == member["value"]:
+            sig += " : " + member["value"]
+
+    doc, vartype = convert_docblock(member["doc"])
+    if kind == "property" and (vartype or member["type"]):
+        sig += " : " + (vartype or member["type"])
+    return [f".. php:{directive}:: {sig}", ""] + _indent(doc) + [""]
+
+
+def function_signature(decl):
+    sig = "%s(%s)" % (decl["name"], ", ".join(_param(p) for p in decl["params"]))
+    if decl["returns"]:
+        sig += " -> " + decl["returns"]
+    return sig
+
+
+def declaration_lines(decl, options):
+    """
+    Return the reST directives describing a top-level declaration.
+    """
+    if decl["kind"] in CLASSLIKES:
+        return classlike_lines(decl, options)
+    if decl["kind"] == "function":
+        lines = [f".. php:function:: {function_signature(decl)}", ""]
+    else:
+        lines = [f".. php:const:: {decl['name']}", ""]
+    lines += _indent(convert_docblock(decl["doc"])[0])
+    lines.append("")
+    return lines
+
+
+class PhpAutodocDirective(Directive):
+    """
+    Base class for directives generating documentation from PHP sources.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {
+        "file": directives.unchanged_required,
+        "members": directives.flag,
+        "undoc-members": directives.flag,
+        "private-members": directives.flag,
+    }
+
+    def read_declarations(self, path):
+        env = self.state.document.settings.env
+        env.note_dependency(path)
+        return get_source_cache(env).get(path)
+
+    def source_path(self, filename):
+        env = self.state.document.settings.env
+        return env.relfn2path(filename, env.docname)[1]
+
+    def symbols(self):
+        """
+        Return the symbol table filled by scanning ``php_source_roots``.
+        """
+        env = self.state.document.settings.env
+        data = env.get_domain("php").data
+        return data.get("sources", {}), data.get("source_namespaces", {})
+
+    def find_declarations(self):
+        raise NotImplementedError("must be implemented in subclasses")
+
+    def run(self):
+        env = self.state.document.settings.env
+        location = (env.docname, self.lineno)
+        try:
+            declarations = self.find_declarations()
+        except OSError as err:
+            log_warning(location, f"cannot read PHP source: {err}")
+            return []
+        except PhpParseError as err:
+            log_warning(location, f"cannot parse PHP source {err}")
+            return []
+        if not declarations:
+            log_warning(location, f"nothing to document for {self.arguments[0]}")
+            return []
+
+        previous = env.temp_data.get("php:namespace")
+        lines = []
+        namespace = previous
+        for decl in declarations:
+            if decl["namespace"] != namespace:
+                namespace = decl["namespace"]
+                lines += [f".. php:currentnamespace:: {namespace or 'None'}", ""]
+            lines += declaration_lines(decl, self.options)
+        if namespace != previous:
+            lines += [f".. php:currentnamespace:: {previous or 'None'}", ""]
+
+        source = self.state_machine.get_source_and_line(self.lineno)[0]
+        content = StringList(lines, source)
+        node = nodes.section()
+        node.document = self.state.document
+        nested_parse_with_titles(self.state, content, node)
+        return node.children
+
+
+class PhpAutoClass(PhpAutodocDirective):
+    """
+    Document a class, interface, trait or enum read from ``:file:``, or
+    found in the scanned ``php_source_roots``.
+    """
+
+    def find_declarations(self):
+        name = self.arguments[0].lstrip("\\")
+        if "file" in self.options:
+            path = self.source_path(self.options["file"])
+        else:
+            sources, _namespaces = self.symbols()
+            if name not in sources:
+                return []
+            path = sources[name][1]
+        for decl in self.read_declarations(path):
+            if decl["kind"] not in CLASSLIKES:
+                continue
+            qualified = decl["name"]
+            if decl["namespace"]:
+                qualified = decl["namespace"] + "\\" + qualified
+            if name in (qualified, decl["name"]):
+                return [decl]
+        return []
+
+
+class PhpAutoModule(PhpAutodocDirective):
+    """
+    Document every declaration of a PHP file, or of a namespace found in
+    the scanned ``php_source_roots``.
+    """
+
+    def find_declarations(self):
+        argument = self.arguments[0]
+        if argument.endswith(".php"):
+            return self.read_declarations(self.source_path(argument))
+
+        namespace = argument.strip("\\")
+        env = self.state.document.settings.env
+        # files added to the namespace later document it again
+        env.get_domain("php").note_source_namespace(env.docname, namespace)
+        _sources, namespaces = self.symbols()
+        declarations = []
+        for path in namespaces.get(namespace, ()):
+            declarations.extend(
+                decl
+                for decl in self.read_declarations(path)
+                if decl["namespace"] == namespace
+            )
+        return declarations
@@ -0,0 +1,81 @@
+"""
+Tracking of the documents referencing PHP objects.
+
+Sphinx only rewrites the documents it read again, so a document linking to a
+method that was added, removed or moved elsewhere keeps its stale link until
+a full rebuild. The short names of the PHP references of every document are
+recorded when it is read, misses included. After reading, the objects,
+class parents and namespaces of the documents read are compared with what
+they defined before, and the documents referencing any of the changed names
+are written again.
+
+A reference is recorded under the last name of its target and of the class it
+belongs to, so a document is rewritten whenever a changed object could
+change the resolution of one of its references.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+from sphinx import addnodes
+
+from .symbols import short_name
+
+
+def reference_keys(domain, docname, node):
+    """
+    Yield the names a change of which may change what node resolves to.
+    """
+    target = node["reftarget"]
+    name, sep, rest = target.partition(":")
+    if sep and not rest.startswith(":"):
+        # an explicit "inventory:target"
+        target = rest
+    if target[-2:] == "()":
+        target = target[:-2]
+    targets = [target]
+    expanded = domain.expand_name(docname, node.get("php:namespace"), target)
+    if expanded:
+        targets.append(expanded)
+    for target in targets:
+        yield short_name(target)
+        owner, sep, _member = target.rpartition("::")
+        if sep:
+            yield short_name(owner)
+    if node.get("php:class"):
+        # members are also looked up in the current class and its parents
+        yield short_name(node["php:class"])
+
+
+def note_references(app, doctree):
+    """
+    Record the names referenced by the PHP references of the document.
+    """
+    domain = app.env.get_domain("php")
+    docname = app.env.docname
+    keys = set()
+    for node in doctree.findall(addnodes.pending_xref):
+        if node.get("refdomain") == "php" or node.get("reftype") == "any":
+            keys.update(reference_keys(domain, docname, node))
+    keys.discard("")
+    if keys:
+        domain.note_references(docname, keys)
+
+
+def note_read_docs(app, env, docnames):
+    env.get_domain("php").reading.update(docnames)
+
+
+def get_updated(app, env):
+    """
+    Return the documents referencing the objects changed by this build.
+    """
+    domain = env.get_domain("php")
+    changed = {short_name(name) for name in domain.changed_names()}
+    if not changed:
+        return []
+    return [
+        docname
+        for docname, keys in domain.data["references"].items()
+        if not changed.isdisjoint(keys)
+    ]
@@ -0,0 +1,217 @@
+"""
+Aggregated warnings of the PHP domain.
+
+Large references can repeat the same warning thousands of times, like a
+missing reference to a class every page mentions under ``nitpicky``. With
+``php_diagnostics_limit`` set, warnings are collected during the build
+instead, grouped by kind and deduplicated, and only the most frequent ones
+of each kind are logged when the build finishes, with their counts. Every
+collected warning is also written to ``php_diagnostics.json`` in the output
+directory. Warnings of parallel read workers travel back with the domain
+data; parallel write workers do not report back to the main process, so the
+few warnings raised while writing are logged as they occur.
+
+Reported warnings are regular Sphinx warnings, so ``-W`` still fails the build
+and ``suppress_warnings`` still applies.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import json
+
+from sphinx.locale import __
+from sphinx.util import logging
+from sphinx.util.logging import get_node_location
+
+try:
+    from sphinx.util.build_phase import BuildPhase
+except ImportError:  # Sphinx < 3
+    BuildPhase = None
+
+logger = logging.getLogger(__name__)
+
+
+class PhpDiagnostics:
+    """
+    Collects warnings by (type, subtype) and counts repeated messages.
+    """
+
+    filename = "php_diagnostics.json"
+
+    def __init__(self, env, limit, builder=None):
+        self.env = env
+        self.limit = limit
+        self.builder = builder
+        self.pid = os.getpid()
+        self.buckets = {}  # (type, subtype) -> {message: [count, location]}
+
+    def warn(self, message, location=None, type="phpdomain", subtype=None):
+        """
+        Collect a warning, location is a node, a (docname, line) or a string.
+        """
+        buckets = self.buckets
+        if os.getpid() != self.pid:
+            if self._writing():
+                # Sphinx replays the log of parallel write workers
+                logger.warning(message, location=location, type=type, subtype=subtype)
+                return
+            # parallel read worker, the warnings travel back with the domain data
+            buckets = self.env.domaindata["php"].setdefault("diagnostics", {})
+        bucket = buckets.get((type, subtype))
+        if bucket is None:
+            bucket = buckets[type, subtype] = {}
+        entry = bucket.get(message)
+        if entry is None:
+            if hasattr(location, "tagname"):
+                location = get_node_location(location)
+            bucket[message] = [1, location]
+        else:
+            entry[0] += 1
+
+    def _writing(self):
+        if BuildPhase is None:
+            return False
+        phase = getattr(self.builder, "phase", None)
+        return phase == BuildPhase.WRITING
+
+    def merge(self, buckets):
+        for key, messages in buckets.items():
+            bucket = self.buckets.setdefault(key, {})
+            for message, (count, location) in messages.items():
+                entry = bucket.get(message)
+                if entry is None:
+                    bucket[message] = [count, location]
+                else:
+                    entry[0] += count
+
+    def entries(self, key):
+        """
+        Return (message, count, location) of a bucket, most frequent first.
+        """
+        return sorted(
+            (
+                (message, count, location)
+                for message, (count, location) in self.buckets[key].items()
+            ),
+            key=lambda entry: (-entry[1], entry[0]),
+        )
+
+    def flush(self):
+        """
+        Log the most frequent warnings of every kind.
+        """
+        for type, subtype in sorted(
+            self.buckets, key=lambda key: (key[0], key[1] or "")
+        ):
+            entries = self.entries((type, subtype))
+            for message, count, location in entries[: self.limit]:
+                if count > 1:
+                    message += " (%d times)" % count
+                logger.warning(message, location=location, type=type, subtype=subtype)
+            hidden = entries[self.limit :]
+            if hidden:
+                kind = type + (subtype and "." + subtype or "")
+                logger.warning(
+                    "[phpdomain] %d more %s warnings (%d occurrences), see %s",
+                    len(hidden),
+                    kind,
+                    sum(entry[1] for entry in hidden),
+                    self.filename,
+                    type=type,
+                    subtype=subtype,
+                )
+
+    def as_json(self):
+        warnings = []
+        for type, subtype in sorted(
+            self.buckets, key=lambda key: (key[0], key[1] or "")
+        ):
+            for message, count, location in self.entries((type, subtype)):
+                warnings.append(
+                    {
+                        "type": type,
+                        "subtype": subtype,
+                        "message": message,
+                        "count": count,
+                        "location": location,
+                    }
+                )
+        return {"warnings": warnings}
+
+
+php_diagnostics = None
+
+
+def warn(message, location=None, type="phpdomain", subtype=None):
+    """
+    Collect a warning, or log it right away when warnings are not aggregated.
+    """
+    if php_diagnostics is None:
+        logger.warning(message, location=location, type=type, subtype=subtype)
+    else:
+        php_diagnostics.warn(message, location, type, subtype)
+
+
+def log_info(fromdocnode, message: str):
+    """
+    Log informative message. Should have no effect on exit code.
+    """
+    logger.info(f"[phpdomain] {message}", location=fromdocnode)
+
+
+def log_warning(fromdocnode, message: str):
+    """
+    Log warning. Should set exit code to non-zero.
+    """
+    warn(f"[phpdomain] {message}", fromdocnode)
+
+
+def merge_warnings(buckets):
+    """
+    Merge the warnings collected by a parallel read worker.
+    """
+    if php_diagnostics is not None:
+        php_diagnostics.merge(buckets)
+
+
+def warn_missing_reference(app, domain, node):
+    """
+    Collect the warnings of unresolved PHP references.
+    """
+    if php_diagnostics is None or domain is None or domain.name != "php":
+        return None
+    if os.getpid() != php_diagnostics.pid:
+        # parallel write workers do not report back, let Sphinx log it
+        return None
+    typ = node["reftype"]
+    message = __("%s:%s reference target not found: %s") % (
+        "php",
+        typ,
+        node["reftarget"],
+    )
+    php_diagnostics.warn(message, node, "ref", typ)
+    return True
+
+
+def _diagnostics_builder_inited(app):
+    global php_diagnostics
+    limit = app.config.php_diagnostics_limit
+    if limit is not None:
+        # -D passes the limit as a string, the default being None
+        php_diagnostics = PhpDiagnostics(app.env, int(limit), app.builder)
+
+
+def _diagnostics_build_finished(app, exception):
+    global php_diagnostics
+    if php_diagnostics is None:
+        return
+    diagnostics, php_diagnostics = php_diagnostics, None
+    if not diagnostics.buckets:
+        return
+    diagnostics.flush()
+    if os.path.isdir(app.outdir):
+        path = os.path.join(app.outdir, diagnostics.filename)
+        with open(path, "w") as fp:
+            json.dump(diagnostics.as_json(), fp, indent=2)
@@ -0,0 +1,1425 @@
+"""
+Sphinx PHP domain.
+
+The PHP domain. Based off of the rubydomain by SHIBUKAWA Yoshiki
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import re
+import json
+import heapq
+import bisect
+import time
+import hashlib
+import inspect
+
+from docutils import nodes
+from docutils.parsers.rst import directives, Directive
+
+from sphinx import addnodes
+from sphinx.roles import XRefRole
+from sphinx.locale import _
+from sphinx.domains import Domain, ObjType, Index
+from sphinx.directives import ObjectDescription
+from sphinx.util import logging
+from sphinx.util.nodes import make_refnode
+from sphinx.util.docfields import Field, GroupedField, TypedField
+from sphinx import __version__ as sphinx_version
+
+from .autodoc import PhpAutoClass, PhpAutoModule
+from .dependencies import get_updated, note_read_docs, note_references
+from .export import PhpSymbolsBuilder
+from .indices import (
+    PhpClassIndex,
+    PhpConstantIndex,
+    PhpFunctionIndex,
+    PhpMethodIndex,
+    collect_letter_pages,
+    link_letter_pages,
+)
+from .diagnostics import (
+    _diagnostics_build_finished,
+    _diagnostics_builder_inited,
+    log_info,
+    log_warning,
+    merge_warnings,
+    warn,
+    warn_missing_reference,
+)
+from .intersphinx import load_inventories, missing_reference
+from .members import PhpMembers
+from .scanner import build_symbol_table, outdated_sources
+from .shared import load_shared_stores, missing_reference as missing_shared_reference
+from .resolver import (
+    NS,
+    PhpResolver,
+    _longest_prefix,
+    _prefix_trie,
+)
+from .search import add_search_script, write_search_index
+from .signature import parse_signature, parse_type, split_param
+from .store import PhpObjectTable, note_page_uris, open_object_store
+from .symbols import write_symbol_index
+from .typehints import PhpTypeResolver
+
+logger = logging.getLogger(__name__)
+
+
+def throw_if_false(fromdocnode, value, message: str):
+    """
+    Log warning if the value is not true and throw ValueError. Should set exit code to non-zero.
+    """
+    if not value:
+        log_warning(fromdocnode, message)
+        raise ValueError
+
+
+separators = {
+    "global": None,
+    "namespace": NS,
+    "function": NS,
+    "interface": NS,
+    "class": None,
+    "trait": None,
+    "enum": None,
+    "exception": None,
+    "method": "::",
+    "const": "::",
+    "attr": "::$",
+    "staticmethod": "::",
+    "case": "::",
+}
+
+php_separator = re.compile(r"(\w+)?(?:[:]{2})?")
+
+
+def _add_params(node, params, type_nodes=None):
+    for param in params:
+        if isinstance(param, str):
+            type, rest = split_param(param) if type_nodes else (None, param)
+            if type:
+                paramnode = addnodes.desc_parameter(param, "")
+                paramnode.extend(type_nodes(type))
+                paramnode += nodes.Text(rest)
+            else:
+                paramnode = addnodes.desc_parameter(param, param)
+            node += paramnode
+        else:
+            optional = addnodes.desc_optional()
+            _add_params(optional, param, type_nodes)
+            node += optional
+
+
+def php_rsplit(fullname):
+    items = [item for item in php_separator.findall(fullname)]
+    return "".join(items[:-2]), "".join(items[1:-1])
+
+
+class PhpObject(ObjectDescription):
+    """
+    Description of a general PHP object.
+    """
+
+    option_spec = {
+        "noindex": directives.flag,
+        "noindexentry": directives.flag,
+        "nocontentsentry": directives.flag,
+        "module": directives.unchanged,
+    }
+
+    doc_field_types = [
+        TypedField(
+            "parameter",
+            label=_("Parameters"),
+            names=("param", "parameter", "arg", "argument"),
+            typerolename="obj",
+            typenames=("paramtype", "type"),
+        ),
+        TypedField(
+            "variable",
+            label=_("Variables"),
+            rolename="obj",
+            names=("var", "ivar", "cvar"),
+            typerolename="obj",
+            typenames=("vartype",),
+        ),
+        GroupedField(
+            "exceptions",
+            label=_("Throws"),
+            rolename="exc",
+            names=("throws", "throw", "exception", "except"),
+            can_collapse=True,
+        ),
+        Field(
+            "returnvalue",
+            label=_("Returns"),
+            has_arg=False,
+            names=("returns", "return"),
+        ),
+        Field(
+            "returntype",
+            label=_("Return type"),
+            has_arg=False,
+            names=("rtype", "returntype"),
+            bodyrolename="obj",
+        ),
+    ]
+
+    def get_signature_prefix(self, sig):
+        """
+        May return a prefix to put before the object name in the signature.
+        """
+        return ""
+
+    def needs_arglist(self):
+        """
+        May return true if an empty argument list is to be generated even if
+        the document contains none.
+        """
+        return False
+
+    def handle_signature(self, sig, signode):
+        """
+        Transform a PHP signature into RST nodes.
+        Returns (fully qualified name of the thing, classname if any).
+
+        If inside a class, the current class name is handled intelligently:
+        * it is stripped from the displayed name if present
+        * it is added to the full name (return value) if not present
+        """
+        parsed = parse_signature(sig)
+        if parsed is None:
+            throw_if_false(signode, False, "Invalid signature")
+
+        visibility, modifiers, name_prefix, name, arglist, retann, enumtype = parsed[:7]
+
+        if not name_prefix:
+            name_prefix = ""
+
+        # determine namespace and class name (if applicable), as well as full name
+        namespace = self.options.get(
+            "namespace", self.env.temp_data.get("php:namespace")
+        )
+        separator = separators[self.objtype]
+
+        classname = self.env.temp_data.get("php:class")
+        # Method declared as Class::methodName
+        if not classname and "::" in name_prefix:
+            classname = name_prefix.rstrip("::")
+
+        if self.objtype == "global" or self.objtype == "function":
+            add_module = False
+            namespace = None
+            classname = None
+            fullname = name
+        else:
+            add_module = True
+            if name_prefix:
+                classname = classname.rstrip("::")
+                fullname = name_prefix + name
+
+            # Currently in a class, but not creating another class,
+            elif classname and not self.objtype in [
+                "class",
+                "exception",
+                "interface",
+                "trait",
+                "enum",
+                "function",
+            ]:
+                if not self.env.temp_data["php:in_class"]:
+                    name_prefix = classname + separator
+
+                fullname = classname + separator + name
+            else:
+                classname = ""
+                fullname = name
+
+            # A leading \ means the name is fully qualified
+            # and should not inherit the current namespace.
+            if fullname.startswith(NS) and namespace:
+                add_module = False
+                name = name[1:]
+                fullname = fullname[1:]
+                namespace = None
+
+        signode["namespace"] = namespace
+        signode["class"] = self.class_name = classname
+        signode["fullname"] = fullname
+
+        if visibility:
+            signode += addnodes.desc_annotation(visibility, visibility)
+
+        sig_prefix = self.get_signature_prefix(sig)
+
+        if modifiers and not (sig_prefix and "static" in sig_prefix):
+            signode += addnodes.desc_annotation(modifiers, modifiers)
+
+        if sig_prefix:
+            signode += addnodes.desc_annotation(sig_prefix, sig_prefix)
+
+        if name_prefix:
+            if namespace and not self.env.temp_data["php:in_class"]:
+                name_prefix = namespace + NS + name_prefix
+            signode += addnodes.desc_addname(name_prefix, name_prefix)
+
+        elif add_module and self.env.config.add_module_names:
+            if self.objtype == "global":
+                nodetext = ""
+                signode += addnodes.desc_addname(nodetext, nodetext)
+            else:
+                namespace = self.options.get(
+                    "namespace", self.env.temp_data.get("php:namespace")
+                )
+
+                if namespace and not self.env.temp_data.get("php:in_class", False):
+                    nodetext = namespace + NS
+                    signode += addnodes.desc_addname(nodetext, nodetext)
+
+        signode += addnodes.desc_name(name, name)
+
+        if not arglist:
+            if self.needs_arglist():
+                # for callables, add an empty parameter list
+                signode += addnodes.desc_parameterlist()
+            if retann:
+                signode += addnodes.desc_returns(retann, "", *self.type_nodes(retann))
+            elif enumtype:
+                signode += addnodes.desc_returns(enumtype, enumtype)
+            return fullname, name_prefix
+
+        paramlist = addnodes.desc_parameterlist()
+        _add_params(paramlist, parsed.params, self.type_nodes)
+        signode += paramlist
+
+        if retann:
+            signode += addnodes.desc_returns(retann, "", *self.type_nodes(retann))
+        elif enumtype:
+            signode += addnodes.desc_returns(enumtype, enumtype)
+        return fullname, name_prefix
+
+    def _class_xref(self, name, namespace):
+        if name.startswith(NS):
+            target, namespace = name[1:], None
+        else:
+            target = name
+        refnode = addnodes.pending_xref(
+            "",
+            nodes.Text(name),
+            refdomain="php",
+            reftype="class",
+            reftarget=target,
+            refspecific=True,
+            refdoc=self.env.docname,
+        )
+        refnode["php:namespace"] = namespace
+        refnode["php:class"] = None
+        return refnode
+
+    def type_nodes(self, text):
+        """
+        Return the nodes of a parameter or return type, its class names as
+        references resolved by :class:`PhpTypeResolver`.
+        """
+        namespace = self.options.get(
+            "namespace", self.env.temp_data.get("php:namespace")
+        )
+        result = []
+        for part, is_class in parse_type(text):
+            if is_class:
+                refnode = self._class_xref(part, namespace)
+                refnode["php:type"] = True
+                result.append(refnode)
+            else:
+                result.append(nodes.Text(part))
+        return result
+
+    def _object_hierarchy_parts(self, sig_node: addnodes.desc_signature):
+        if "fullname" not in sig_node:
+            return ()
+        namespace = sig_node.get("namespace")
+        fullname = sig_node["fullname"]
+
+        if isinstance(namespace, str):
+            return (namespace, *fullname.split("::"))
+        else:
+            return tuple(fullname.split("::"))
+
+    def _toc_entry_name(self, sig_node: addnodes.desc_signature) -> str:
+        if not sig_node.get("_toc_parts"):
+            return ""
+
+        config = self.env.app.config
+        objtype = sig_node.parent.get("objtype")
+        if config.add_function_parentheses and objtype in {"function", "method"}:
+            parens = "()"
+        else:
+            parens = ""
+        *parents, name = sig_node["_toc_parts"]
+        if config.toc_object_entries_show_parents == "domain":
+            return sig_node.get("fullname", name) + parens
+        if config.toc_object_entries_show_parents == "hide":
+            return name + parens
+        if config.toc_object_entries_show_parents == "all":
+            if (
+                objtype in {"method", "const", "attr", "staticmethod", "case"}
+                and len(parents) > 0
+            ):
+                name = parents.pop() + "::" + name
+            return "\\".join(parents + [name + parens])
+        return ""
+
+    def get_index_text(self, namespace, name):
+        """
+        Return the text for the index entry of the object.
+        """
+        raise NotImplementedError("must be implemented in subclasses")
+
+    def _is_class_member(self):
+        return self.objtype.startswith("method") or self.objtype.startswith("attr")
+
+    def add_target_and_index(self, name_cls, sig, signode):
+        if self.objtype == "global":
+            namespace = None
+        else:
+            namespace = self.options.get(
+                "namespace", self.env.temp_data.get("php:namespace")
+            )
+        if self._is_class_member():
+            if signode["class"]:
+                prefix = namespace and namespace + NS or ""
+            else:
+                prefix = namespace and namespace + NS or ""
+        else:
+            prefix = namespace and namespace + NS or ""
+        fullname = prefix + name_cls[0]
+
+        # note target
+        if fullname not in self.state.document.ids:
+            signode["names"].append(fullname)
+            signode["ids"].append(fullname)
+            signode["first"] = not self.names
+            self.state.document.note_explicit_target(signode)
+            domain = self.env.get_domain("php")
+            objects = domain.data["objects"]
+            if fullname in objects:
+                warn(
+                    f"duplicate object description of {fullname}, "
+                    f"other instance in {objects[fullname][0]}",
+                    (self.env.docname, self.lineno),
+                    subtype="duplicate",
+                )
+            domain.note_object(fullname, self.objtype, self.env.docname)
+
+        if "noindexentry" not in self.options:
+            indextext = self.get_index_text(namespace, name_cls)
+            if indextext:
+                self.indexnode["entries"].append(
+                    ("single", indextext, fullname, fullname, None)
+                )
+
+
+class PhpGloballevel(PhpObject):
+    """
+    Description of an object on global level (global variables).
+    """
+
+    def get_index_text(self, namespace, name_cls):
+        if self.objtype == "global":
+            return _("%s (global variable)") % name_cls[0]
+        else:
+            return ""
+
+
+class PhpNamespacelevel(PhpObject):
+    """
+    Description of an object on namespace level (functions, constants).
+    """
+
+    def needs_arglist(self):
+        return self.objtype == "function"
+
+    def get_signature_prefix(self, sig):
+        """
+        Adds class prefix for constants created inside classes
+        """
+        if self.objtype == "const":
+            return _("constant ")
+        if self.class_name and self.class_name != "":
+            return self.class_name + "::"
+
+    def get_index_text(self, namespace, name_cls):
+        if self.objtype == "function":
+            if not namespace:
+                return _("%s() (global function)") % name_cls[0]
+            return _("%s() (function in %s)") % (name_cls[0], namespace)
+        elif self.objtype == "const" and self.class_name != "":
+            return _("%s (class constant)") % (name_cls[0])
+        elif self.objtype == "const":
+            if not namespace:
+                return _("%s (global constant)") % (name_cls[0])
+            return _("%s (constant in %s)") % (name_cls[0], namespace)
+        else:
+            return ""
+
+
+class PhpClasslike(PhpObject):
+    """
+    Description of a class-like object
+    (classes, interfaces, traits, enums).
+    """
+
+    option_spec = dict(
+        PhpObject.option_spec,
+        extends=directives.unchanged,
+        implements=directives.unchanged,
+        use=directives.unchanged,
+    )
+
+    def get_signature_prefix(self, sig):
+        return self.objtype + " "
+
+    def parent_names(self, option):
+        """
+        Return the comma separated class names of a hierarchy option.
+        """
+        names = self.options.get(option) or ""
+        return tuple(name.strip() for name in names.split(",") if name.strip())
+
+    def handle_signature(self, sig, signode):
+        fullname, name_prefix = super().handle_signature(sig, signode)
+        for option in ("extends", "implements"):
+            names = self.parent_names(option)
+            if not names:
+                continue
+            keyword = " %s " % option
+            signode += addnodes.desc_annotation(keyword, keyword)
+            for i, name in enumerate(names):
+                if i:
+                    signode += addnodes.desc_annotation(", ", ", ")
+                signode += self._class_xref(name, signode["namespace"])
+        return fullname, name_prefix
+
+    def add_target_and_index(self, name_cls, sig, signode):
+        super().add_target_and_index(name_cls, sig, signode)
+        parents = tuple(
+            self.parent_names(option) for option in ("extends", "implements", "use")
+        )
+        if any(parents) and signode["ids"]:
+            domain = self.env.get_domain("php")
+            parents = tuple(
+                tuple(self._qualified_parent(domain, signode, name) for name in names)
+                for names in parents
+            )
+            domain.note_hierarchy(signode["ids"][0], self.env.docname, *parents)
+
+    def _qualified_parent(self, domain, signode, name):
+        # imported names are stored fully qualified
+        expanded = domain.expand_name(self.env.docname, signode["namespace"], name)
+        return NS + expanded if expanded else name
+
+    def get_index_text(self, namespace, name_cls):
+        if self.objtype == "class":
+            if not namespace:
+                return _("%s (class)") % name_cls[0]
+            return _("%s (class in %s)") % (name_cls[0], namespace)
+        elif self.objtype == "interface":
+            if not namespace:
+                return _("%s (interface)") % name_cls[0]
+            return _("%s (interface in %s)") % (name_cls[0], namespace)
+        elif self.objtype == "trait":
+            if not namespace:
+                return _("%s (trait)") % name_cls[0]
+            return _("%s (trait in %s)") % (name_cls[0], namespace)
+        elif self.objtype == "enum":
+            if not namespace:
+                return _("%s (enum)") % name_cls[0]
+            return _("%s (enum in %s)") % (name_cls[0], namespace)
+        elif self.objtype == "exception":
+            return name_cls[0]
+        else:
+            return ""
+
+    def after_content(self):
+        self.env.temp_data["php:in_class"] = False
+
+    def before_content(self):
+        self.env.temp_data["php:in_class"] = True
+        if self.names:
+            self.env.temp_data["php:class"] = self.names[0][0]
+
+
+class PhpClassmember(PhpObject):
+    """
+    Description of a class member (methods, properties).
+    """
+
+    def get_signature_prefix(self, sig):
+        if self.objtype == "attr":
+            return _("property ")
+        if self.objtype == "staticmethod":
+            return _("static ")
+        if self.objtype == "case":
+            return _("case ")
+        return ""
+
+    def needs_arglist(self):
+        return self.objtype == "method"
+
+    def get_index_text(self, namespace, name_cls):
+        name, cls = name_cls
+
+        if (
+            self.objtype.endswith("method")
+            or self.objtype == "attr"
+            or self.objtype == "case"
+        ):
+            try:
+                clsname, propname = php_rsplit(name)
+            except ValueError:
+                propname = name
+                clsname = None
+
+        if self.objtype.endswith("method"):
+            if namespace and clsname is None:
+                return _("%s() (in namespace %s)") % (name, namespace)
+            elif namespace and self.env.config.add_module_names:
+                return _("%s() (%s\\%s method)") % (propname, namespace, clsname)
+            else:
+                return _("%s() (%s method)") % (propname, clsname)
+        elif self.objtype == "attr":
+            if namespace and clsname is None:
+                return _("%s (in namespace %s)") % (name, namespace)
+            elif namespace and self.env.config.add_module_names:
+                return _("%s (%s\\%s property)") % (propname, namespace, clsname)
+            else:
+                return _("%s (%s property)") % (propname, clsname)
+        elif self.objtype == "case":
+            if namespace and clsname is None:
+                return _("%s enum case") % (name)
+            elif namespace and self.env.config.add_module_names:
+                return _("%s (%s\\%s enum case)") % (propname, namespace, clsname)
+            else:
+                return _("%s (%s enum case)") % (propname, clsname)
+        else:
+            return ""
+
+
+class PhpNamespace(Directive):
+    """
+    Directive to start a new PHP namespace, which is similar to module.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {
+        "synopsis": lambda x: x,
+        "noindex": directives.flag,
+        "deprecated": directives.flag,
+    }
+
+    def run(self):
+        env = self.state.document.settings.env
+        namespace = self.arguments[0].strip()
+        noindex = "noindex" in self.options
+        env.temp_data["php:namespace"] = namespace
+        env.temp_data["php:class"] = None
+        env.get_domain("php").note_namespace(
+            namespace,
+            env.docname,
+            self.options.get("synopsis", ""),
+            "deprecated" in self.options,
+        )
+
+        targetnode = nodes.target("", "", ids=["namespace-" + namespace], ismod=True)
+        self.state.document.note_explicit_target(targetnode)
+        ret = [targetnode]
+
+        # the synopsis isn't printed; in fact, it is only used in the
+        # modindex currently
+        if not noindex:
+            indextext = _("%s (namespace)") % namespace
+            inode = addnodes.index(
+                entries=[
+                    ("single", indextext, "namespace-" + namespace, namespace, None)
+                ]
+            )
+            ret.append(inode)
+        return ret
+
+
+class PhpCurrentNamespace(Directive):
+    """
+    This directive is just to tell Sphinx that we're documenting
+    stuff in namespace foo, but links to namespace foo won't lead here.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = False
+    option_spec = {}
+
+    def run(self):
+        env = self.state.document.settings.env
+        namespace = self.arguments[0].strip()
+        if namespace == "None":
+            env.temp_data["php:namespace"] = None
+        else:
+            env.temp_data["php:namespace"] = namespace
+        return []
+
+
+php_use_re = re.compile(r"^\\?(?P<name>\w+(?:\\\w+)*)(?:\s+as\s+(?P<alias>\w+))?$")
+
+
+class PhpUse(Directive):
+    """
+    Directive to import classes or namespaces under an alias, like PHP's
+    ``use`` statement. The aliases apply to every reference of the document.
+    """
+
+    has_content = False
+    required_arguments = 1
+    optional_arguments = 0
+    final_argument_whitespace = True
+    option_spec = {}
+
+    def run(self):
+        env = self.state.document.settings.env
+        domain = env.get_domain("php")
+        for clause in self.arguments[0].split(","):
+            m = php_use_re.match(clause.strip())
+            if m is None:
+                log_warning(
+                    (env.docname, self.lineno), f"Invalid use statement: {clause}"
+                )
+                continue
+            name = m.group("name")
+            alias = m.group("alias") or name.rpartition(NS)[2]
+            domain.note_alias(alias, name, env.docname)
+        return []
+
+
+class PhpXRefRole(XRefRole):
+    """
+    Provides cross reference links for PHP objects
+    """
+
+    def process_link(self, env, refnode, has_explicit_title, title, target):
+        if not has_explicit_title:
+            if title.startswith("::"):
+                title = title[2:]
+            target = target.lstrip("~")  # only has a meaning for the title
+
+            # If the first char is ~ don't display the leading namespace & class.
+            if title.startswith("~"):
+                m = re.search(r"(?:.+[:]{2}|(?:.*?\\{1,2})+)?(.*)\Z", title)
+                if m:
+                    title = m.group(1)
+
+        refnode["php:namespace"] = env.temp_data.get("php:namespace")
+        refnode["php:class"] = env.temp_data.get("php:class")
+
+        return title, target
+
+
+class PhpNamespaceIndex(Index):
+    """
+    Index subclass to provide the PHP namespace index.
+    """
+
+    name = "modindex"
+    localname = _("PHP Namespace Index")
+    shortname = _("namespaces")
+
+    def generate(self, docnames=None):
+        ignores = tuple(self.domain.env.config["modindex_common_prefix"])
+        cache = self.domain.data.get("namespace_index")
+        if docnames or cache is None or cache[0] != ignores:
+            return self._generate(docnames, ignores)
+        return cache[2], cache[3]
+
+    def update(self):
+        """
+        Generate the index again if the namespaces changed since the last
+        build. Runs once the documents are read, so the index is pickled
+        with the environment and reused by the next builds.
+        """
+        ignores = tuple(self.domain.env.config["modindex_common_prefix"])
+        digest = self._digest()
+        cache = self.domain.stashed_namespace_index
+        if cache is None or cache[0] != ignores or cache[1] != digest:
+            content, collapse = self._generate(None, ignores)
+            cache = (ignores, digest, content, collapse)
+        self.domain.data["namespace_index"] = cache
+
+    def _digest(self):
+        """
+        Return a digest of the namespaces, the key of the cached index.
+        """
+        namespaces = sorted(self.domain.data["namespaces"].items())
+        return hashlib.sha1(repr(namespaces).encode()).hexdigest()
+
+    def _generate(self, docnames, ignores):
+        content = {}
+        # prefixes to ignore, the longest match is stripped
+        ignores = _prefix_trie(ignores)
+        # list of all namespaces, sorted by name
+        data = self.domain.data["namespaces"]
+        namespaces = [
+            (namespace, data[namespace])
+            for _lower, namespace in self.domain.data["namespace_order"]
+        ]
+        # sort out collapsable namespaces
+        prev_namespace = ""
+        num_toplevels = 0
+        for namespace, (docname, synopsis, deprecated) in namespaces:
+            if docnames and docname not in docnames:
+                continue
+
+            stripped = _longest_prefix(ignores, namespace)
+            namespace = namespace[len(stripped) :]
+
+            # we stripped the whole namespace name?
+            if not namespace:
+                namespace, stripped = stripped, ""
+
+            entries = content.setdefault(namespace[0].lower(), [])
+
+            package = namespace.split(NS)[0]
+            if package != namespace:
+                # it's a subnamespace
+                if prev_namespace == package:
+                    # first subnamespace - make parent a group head
+                    entries[-1][1] = 1
+                elif not prev_namespace.startswith(package):
+                    # subnamespace without parent in list, add dummy entry
+                    entries.append([stripped + package, 1, "", "", "", "", ""])
+                subtype = 2
+            else:
+                num_toplevels += 1
+                subtype = 0
+
+            qualifier = deprecated and str(_("Deprecated")) or ""
+            entries.append(
+                [
+                    stripped + namespace,
+                    subtype,
+                    docname,
+                    "namespace-" + stripped + namespace,
+                    "",
+                    qualifier,
+                    synopsis,
+                ]
+            )
+            prev_namespace = namespace
+
+        # apply heuristics when to collapse modindex at page load:
+        # only collapse if number of toplevel namespaces is larger than
+        # number of subnamespaces
+        collapse = len(namespaces) - num_toplevels < num_toplevels
+
+        # sort by first letter
+        content = sorted(content.items())
+
+        return content, collapse
+
+
+def stash_namespace_index(app, env, docnames):
+    domain = env.get_domain("php")
+    # parallel read workers pickle the domain data back, not the index
+    domain.stashed_namespace_index = domain.data.pop("namespace_index", None)
+
+
+def update_namespace_index(app, env):
+    PhpNamespaceIndex(env.get_domain("php")).update()
+
+
+class PhpDomain(Domain):
+    """
+    PHP language domain.
+    """
+
+    name = "php"
+    label = "PHP"
+    object_types = {
+        "function": ObjType(_("function"), "func", "obj"),
+        "global": ObjType(_("global variable"), "global", "obj"),
+        "const": ObjType(_("const"), "const", "obj"),
+        "method": ObjType(_("method"), "meth", "obj"),
+        "class": ObjType(_("class"), "class", "obj"),
+        "attr": ObjType(_("attribute"), "attr", "obj"),
+        "exception": ObjType(_("exception"), "exc", "obj"),
+        "namespace": ObjType(_("namespace"), "ns", "obj"),
+        "interface": ObjType(_("interface"), "interface", "obj"),
+        "trait": ObjType(_("trait"), "trait", "obj"),
+        "enum": ObjType(_("enum"), "enum", "obj"),
+        "case": ObjType(_("case"), "case", "obj"),
+    }
+
+    directives = {
+        "function": PhpNamespacelevel,
+        "global": PhpGloballevel,
+        "const": PhpNamespacelevel,
+        "class": PhpClasslike,
+        "method": PhpClassmember,
+        "staticmethod": PhpClassmember,
+        "attr": PhpClassmember,
+        "case": PhpClassmember,
+        "members": PhpMembers,
+        "exception": PhpClasslike,
+        "interface": PhpClasslike,
+        "trait": PhpClasslike,
+        "enum": PhpClasslike,
+        "namespace": PhpNamespace,
+        "currentmodule": PhpCurrentNamespace,
+        "currentnamespace": PhpCurrentNamespace,
+        "use": PhpUse,
+        "autoclass": PhpAutoClass,
+        "automodule": PhpAutoModule,
+    }
+
+    roles = {
+        "func": PhpXRefRole(fix_parens=False),
+        "global": PhpXRefRole(),
+        "class": PhpXRefRole(),
+        "exc": PhpXRefRole(),
+        "meth": PhpXRefRole(fix_parens=False),
+        "attr": PhpXRefRole(),
+        "const": PhpXRefRole(),
+        "ns": PhpXRefRole(),
+        "obj": PhpXRefRole(),
+        "interface": PhpXRefRole(),
+        "trait": PhpXRefRole(),
+        "enum": PhpXRefRole(),
+        "case": PhpXRefRole(),
+    }
+
+    initial_data = {
+        "objects": PhpObjectTable(),  # fullname -> docname, objtype
+        "namespaces": {},  # namespace -> docname, synopsis
+        "docs": {},  # docname -> set of namespaces
+        "namespace_order": [],  # sorted list of (lowercased namespace, namespace)
+        "hierarchy": {},  # docname -> {class: (extends, implements, uses)}
+        "aliases": {},  # docname -> {alias: imported name}
+        "references": {},  # docname -> set of referenced short names
+        "source_users": {},  # docname -> set of scanned namespaces it documents
+    }
+    indices = [
+        PhpNamespaceIndex,
+        PhpClassIndex,
+        PhpFunctionIndex,
+        PhpMethodIndex,
+        PhpConstantIndex,
+    ]
+
+    def __init__(self, env):
+        super().__init__(env)
+        self._resolver = None
+        self._types = {}  # type lookup -> (fullname, docname) or None
+        self._object_list = None  # sorted get_objects() entries
+        self.inventories = []  # PhpInventory of each intersphinx inventory
+        # data["namespace_index"] while the documents are read
+        self.stashed_namespace_index = None
+        # scanned namespaces whose files changed since the last build
+        self.changed_source_namespaces = set()
+        self.shared_stores = []  # PhpSharedStore of php_shared_object_stores
+        # definitions of the documents cleared and read since changed_names()
+        self.cleared = {}
+        self.reading = set()
+
+    def note_object(self, fullname, objtype, docname):
+        """
+        Register a PHP object defined in docname.
+        """
+        self.data["objects"][fullname] = (docname, objtype)
+        self._resolver = None
+        self._types = {}
+        self._object_list = None
+
+    def note_namespace(self, namespace, docname, synopsis, deprecated):
+        """
+        Register a PHP namespace defined in docname.
+        """
+        if namespace not in self.data["namespaces"]:
+            bisect.insort(self.data["namespace_order"], (namespace.lower(), namespace))
+        self.data["namespaces"][namespace] = (docname, synopsis, deprecated)
+        self.data["docs"].setdefault(docname, set()).add(namespace)
+        self._resolver = None
+        self._types = {}
+        self._object_list = None
+
+    def note_hierarchy(self, fullname, docname, extends, implements, uses):
+        """
+        Register the classes, interfaces and traits a class defined in
+        docname inherits from.
+        """
+        self.data["hierarchy"].setdefault(docname, {})[fullname] = (
+            extends,
+            implements,
+            uses,
+        )
+        self._resolver = None
+        self._types = {}
+
+    def note_alias(self, alias, name, docname):
+        """
+        Register a class or namespace imported under alias in docname.
+        """
+        self.data["aliases"].setdefault(docname, {})[alias] = name
+
+    def expand_name(self, docname, namespace, name):
+        """
+        Return name with its first part replaced by the class or namespace
+        imported under that alias in docname, or by the current namespace for
+        "namespace\\", or None if it has no such part.
+        """
+        if name.startswith("namespace" + NS):
+            name = name[len("namespace" + NS) :]
+            return namespace and namespace + NS + name or name
+        aliases = self.data["aliases"].get(docname)
+        if not aliases:
+            return None
+        alias = re.match(r"[^\\:]*", name).group()
+        if alias not in aliases:
+            return None
+        return aliases[alias] + name[len(alias) :]
+
+    def note_references(self, docname, names):
+        """
+        Register the short names referenced by docname.
+        """
+        self.data["references"][docname] = names
+
+    def note_source_namespace(self, docname, namespace):
+        """
+        Register that docname documents a namespace of the scanned sources.
+        """
+        self.data["source_users"].setdefault(docname, set()).add(namespace)
+
+    def definitions(self, docname):
+        """
+        Return the objects, class parents and namespaces defined by docname.
+        """
+        objects = self.data["objects"]
+        return (
+            {fullname: objects[fullname][1] for fullname in objects.names_in(docname)},
+            self.data["hierarchy"].get(docname, {}),
+            set(self.data["docs"].get(docname, ())),
+        )
+
+    def changed_names(self):
+        """
+        Return the names of the objects, class parents and namespaces the
+        documents read since the last call added, removed or moved.
+        """
+        changed = set()
+        empty = ({}, {}, set())
+        for docname in self.reading | self.cleared.keys():
+            old_objects, old_parents, old_namespaces = self.cleared.get(docname, empty)
+            objects, parents, namespaces = self.definitions(docname)
+            for old, new in ((old_objects, objects), (old_parents, parents)):
+                changed.update(
+                    name
+                    for name in old.keys() | new.keys()
+                    if old.get(name) != new.get(name)
+                )
+            changed.update(old_namespaces ^ namespaces)
+        self.cleared = {}
+        self.reading = set()
+        return changed
+
+    def clear_doc(self, docname):
+        self.cleared.setdefault(docname, self.definitions(docname))
+        self.data["objects"].clear_doc(docname)
+        self.data["hierarchy"].pop(docname, None)
+        self.data["aliases"].pop(docname, None)
+        self.data["references"].pop(docname, None)
+        self.data["source_users"].pop(docname, None)
+        self._resolver = None
+        self._types = {}
+        self._object_list = None
+        for ns in self.data["docs"].pop(docname, ()):
+            # the namespace may have been redefined by another document since
+            if self.data["namespaces"].get(ns, ("",))[0] == docname:
+                del self.data["namespaces"][ns]
+                order = self.data["namespace_order"]
+                del order[bisect.bisect_left(order, (ns.lower(), ns))]
+
+    def merge_domaindata(self, docnames, otherdata):
+        profile = otherdata.pop("profile", None)
+        if profile and php_profiler is not None:
+            php_profiler.merge(profile)
+        diagnostics = otherdata.pop("diagnostics", None)
+        if diagnostics:
+            merge_warnings(diagnostics)
+        otherobjects = otherdata["objects"]
+        for docname in docnames:
+            for fullname in otherobjects.names_in(docname):
+                self.note_object(fullname, otherobjects[fullname][1], docname)
+            for ns in otherdata["docs"].get(docname, ()):
+                data = otherdata["namespaces"].get(ns, ("",))
+                if data[0] == docname:
+                    self.note_namespace(ns, *data)
+            for fullname, parents in otherdata["hierarchy"].get(docname, {}).items():
+                self.note_hierarchy(fullname, docname, *parents)
+            for alias, name in otherdata["aliases"].get(docname, {}).items():
+                self.note_alias(alias, name, docname)
+            if docname in otherdata["references"]:
+                self.note_references(docname, otherdata["references"][docname])
+            for namespace in otherdata["source_users"].get(docname, ()):
+                self.note_source_namespace(docname, namespace)
+
+    def resolve_any_xref(self, env, fromdocname, builder, target, node, contnode):
+        # Every object role shares the same lookup, so the first role to match
+        # is always "func"; namespaces are only tried when no object matched.
+        refnode = self._resolve_object_xref(
+            env, fromdocname, builder, "func", target, node, contnode
+        )
+        if refnode:
+            return [("php:func", refnode)]
+        refnode = self._resolve_namespace_xref(fromdocname, builder, target, contnode)
+        if refnode:
+            return [("php:ns", refnode)]
+        return []
+
+    def resolve_xref(self, env, fromdocname, builder, typ, target, node, contnode):
+        if node.get("php:type"):
+            # PhpTypeResolver already looked the type up
+            return None
+        if typ == "ns" or typ == "obj" and target in self.data["namespaces"]:
+            return self._resolve_namespace_xref(fromdocname, builder, target, contnode)
+        return self._resolve_object_xref(
+            env, fromdocname, builder, typ, target, node, contnode
+        )
+
+    def _resolve_namespace_xref(self, fromdocname, builder, target, contnode):
+        docname, synopsis, deprecated = self.data["namespaces"].get(
+            target, ("", "", "")
+        )
+        if not docname:
+            return None
+        title = "%s%s" % (synopsis, (deprecated and " (deprecated)" or ""))
+        return make_refnode(
+            builder,
+            fromdocname,
+            docname,
+            "namespace-" + target,
+            contnode,
+            title,
+        )
+
+    def _resolve_object_xref(
+        self, env, fromdocname, builder, typ, target, node, contnode
+    ):
+        namespace = node.get("php:namespace")
+        clsname = node.get("php:class")
+        searchorder = node.hasattr("refspecific") and 1 or 0
+        name, obj = self.find_obj(
+            env, node, namespace, clsname, target, typ, searchorder
+        )
+        if not obj:
+            return None
+        return make_refnode(builder, fromdocname, obj[0], name, contnode, name)
+
+    @property
+    def resolver(self):
+        if self._resolver is None:
+            hierarchy = {}
+            for classes in self.data["hierarchy"].values():
+                hierarchy.update(classes)
+            self._resolver = PhpResolver(
+                self.data["objects"],
+                hierarchy,
+                self.data["namespaces"],
+                casefold=self.env.config.php_case_insensitive,
+            )
+        return self._resolver
+
+    def find_obj(
+        self, env, fromdocnode, namespace, classname, name, type, searchorder=0
+    ):
+        """
+        Find a PHP object for "name", using the given namespace and classname.
+        """
+        # strip parenthesis
+        if name[-2:] == "()":
+            name = name[:-2]
+
+        if not name:
+            return None, None
+
+        resolver = self.resolver
+        newname = None
+        expanded = self.expand_name(fromdocnode.get("refdoc"), namespace, name)
+        if expanded:
+            newname = resolver.resolve(None, None, expanded, type)
+            if newname is not None:
+                resolver.last_branch = "alias"
+        if newname is None:
+            newname = resolver.resolve(namespace, classname, name, type, searchorder)
+        if newname is None:
+            return None, None
+        return newname, self.data["objects"][newname]
+
+    def find_type(self, node):
+        """
+        Return the (fullname, docname) of the class the type reference node
+        refers to, or None.
+
+        Lookups are memoized per namespace and name, so the types shared by
+        many signatures are only resolved once.
+        """
+        docname = node["refdoc"]
+        namespace = node["php:namespace"]
+        target = node["reftarget"]
+        expanded = self.expand_name(docname, namespace, target)
+        key = (namespace, target, expanded)
+        try:
+            return self._types[key]
+        except KeyError:
+            pass
+        newname, obj = self.find_obj(
+            self.env, node, namespace, None, target, "class", 1
+        )
+        found = self._types[key] = newname and (newname, obj[0])
+        return found
+
+    def get_objects(self):
+        # the list is only built again once the objects or namespaces change
+        if self._object_list is not None:
+            return self._object_list
+        namespaces, objects = self._object_entries()
+        entries = sorted(namespaces)
+        if not getattr(self.data["objects"], "in_memory", True):
+            # objects stored outside of memory are streamed in fullname order
+            return heapq.merge(entries, objects)
+        entries.extend(objects)
+        entries.sort()
+        self._object_list = entries
+        return entries
+
+    def _object_entries(self):
+        # with a PHP search index the objects are left out of searchindex.js
+        search = not self.env.config.php_search_index
+        namespaces = (
+            (ns, ns, "namespace", info[0], "namespace-" + ns, 0 if search else -1)
+            for ns, info in self.data["namespaces"].items()
+        )
+        objects = (
+            (refname, refname, type, docname, refname, 1 if search else -1)
+            for refname, (docname, type) in self.data["objects"].items()
+        )
+        return namespaces, objects
+
+
+class PhpProfiler:
+    """
+    Opt-in call counters and timers for the domain's hot paths, enabled by
+    the ``php_profile`` config value.
+
+    The profiled methods are only wrapped while profiling is enabled so a
+    normal build runs the plain methods.
+    """
+
+    filename = "php_profile.json"
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.stats = {}  # name -> [calls, seconds]
+        self.phases = {}  # phase -> seconds
+        self.patched = []
+        self.start = time.perf_counter()
+        self.read_end = None
+
+    def targets(self):
+        return [
+            (PhpObject, "handle_signature"),
+            (PhpObject, "add_target_and_index"),
+            (PhpDomain, "find_obj"),
+            (PhpDomain, "clear_doc"),
+            (PhpDomain, "merge_domaindata"),
+            (PhpNamespaceIndex, "generate"),
+        ]
+
+    def install(self):
+        for cls, name in self.targets():
+            method = cls.__dict__[name]
+            self.patched.append((cls, name, method))
+            if name == "find_obj":
+                wrapper = self._wrap_find_obj(method)
+            else:
+                wrapper = self._wrap(method, cls.__name__ + "." + name)
+            setattr(cls, name, wrapper)
+
+    def uninstall(self):
+        while self.patched:
+            cls, name, method = self.patched.pop()
+            setattr(cls, name, method)
+
+    def _wrap(self, method, name):
+        def wrapper(obj, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(obj, *args, **kwargs)
+            finally:
+                self.record(obj, name, time.perf_counter() - start)
+
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def _wrap_find_obj(self, method):
+        def wrapper(domain, env, fromdocnode, namespace, classname, name, *args):
+            start = time.perf_counter()
+            newname, obj = method(
+                domain, env, fromdocnode, namespace, classname, name, *args
+            )
+            self.record(domain, "PhpDomain.find_obj", time.perf_counter() - start)
+
+            if newname is None:
+                self.record(domain, "PhpDomain.find_obj miss", None)
+            else:
+                branch = domain.resolver.last_branch
+                self.record(domain, "PhpDomain.find_obj hit " + branch, None)
+            return newname, obj
+
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def record(self, obj, name, seconds):
+        """
+        Count a call of name taking seconds (None for plain counters).
+        """
+        stats = self.stats
+        if os.getpid() != self.pid:
+            # parallel read worker, the counts travel back with the domain data
+            env = getattr(obj, "env", None) or obj.domain.env
+            stats = env.domaindata["php"].setdefault("profile", {})
+        entry = stats.get(name)
+        if entry is None:
+            entry = stats[name] = [0, 0.0]
+        entry[0] += 1
+        if seconds is not None:
+            entry[1] += seconds
+
+    def merge(self, stats):
+        for name, (calls, seconds) in stats.items():
+            entry = self.stats.setdefault(name, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+    def summary(self):
+        lines = ["%-40s %10s %10s %10s" % ("", "calls", "total s", "mean us")]
+        for name, (calls, seconds) in sorted(self.stats.items()):
+            if not seconds:
+                lines.append("%-40s %10d" % (name, calls))
+            else:
+                mean = seconds / calls * 1e6 if calls else 0
+                lines.append("%-40s %10d %10.3f %10.1f" % (name, calls, seconds, mean))
+        for phase, seconds in self.phases.items():
+            lines.append("%-40s %10s %10.3f" % (phase + " phase", "", seconds))
+        return "\n".join(lines)
+
+    def as_json(self):
+        return {
+            "phases": self.phases,
+            "stats": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in sorted(self.stats.items())
+            },
+        }
+
+
+php_profiler = None
+
+
+def _profile_builder_inited(app):
+    global php_profiler
+    if not app.config.php_profile:
+        return
+    php_profiler = PhpProfiler()
+    php_profiler.install()
+
+
+def _profile_env_updated(app, env):
+    if php_profiler is not None:
+        php_profiler.read_end = time.perf_counter()
+        php_profiler.phases["read"] = php_profiler.read_end - php_profiler.start
+
+
+def _profile_build_finished(app, exception):
+    global php_profiler
+    if php_profiler is None:
+        return
+    profiler, php_profiler = php_profiler, None
+    profiler.uninstall()
+    end = time.perf_counter()
+    if profiler.read_end is not None:
+        profiler.phases["write"] = end - profiler.read_end
+    profiler.phases["total"] = end - profiler.start
+
+    log_info(None, "profile:\n" + profiler.summary())
+    path = os.path.join(app.outdir, profiler.filename)
+    with open(path, "w") as fp:
+        json.dump(profiler.as_json(), fp, indent=2)
+
+
+def setup(app):
+    app.add_domain(PhpDomain)
+    app.add_post_transform(PhpTypeResolver)
+    app.add_builder(PhpSymbolsBuilder)
+    app.add_config_value("php_profile", False, "")
+    app.add_config_value("php_autodoc_cache_dir", None, "")
+    app.add_config_value("php_source_roots", [], "env")
+    app.add_config_value("php_source_jobs", None, "")
+    app.add_config_value("php_diagnostics_limit", None, "")
+    app.add_config_value("php_search_index", False, "html")
+    app.add_config_value("php_object_store", None, "env")
+    app.add_config_value("php_shared_object_stores", {}, "env")
+    app.add_config_value("php_case_insensitive", False, "env")
+    app.connect("builder-inited", build_symbol_table)
+    app.connect("env-get-outdated", outdated_sources)
+    # after intersphinx loaded its inventories, and resolve before it does
+    app.connect("builder-inited", load_inventories, priority=600)
+    app.connect("missing-reference", missing_reference, priority=400)
+    app.connect("builder-inited", load_shared_stores)
+    app.connect("missing-reference", missing_shared_reference, priority=450)
+    app.connect("builder-inited", _profile_builder_inited)
+    app.connect("env-updated", _profile_env_updated)
+    app.connect("build-finished", _profile_build_finished)
+    app.connect("builder-inited", _diagnostics_builder_inited)
+    app.connect("warn-missing-reference", warn_missing_reference)
+    app.connect("build-finished", _diagnostics_build_finished)
+    app.connect("doctree-read", note_references)
+    app.connect("env-before-read-docs", open_object_store, priority=400)
+    app.connect("env-before-read-docs", note_read_docs)
+    app.connect("env-before-read-docs", stash_namespace_index)
+    app.connect("env-get-updated", get_updated)
+    app.connect("env-updated", update_namespace_index)
+    app.connect("env-updated", note_page_uris)
+    app.connect("html-collect-pages", collect_letter_pages)
+    app.connect("html-page-context", link_letter_pages)
+    app.connect("html-page-context", add_search_script)
+    app.connect("build-finished", write_search_index)
+    app.connect("build-finished", write_symbol_index)
+
+    return {
+        "version": sphinx_version,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+        # 1: objects are stored in a PhpObjectTable
+        # 2: class hierarchy
+        # 3: use aliases
+        # 4: referenced names
+        # 5: versions
+        # 6: type references in signatures
+        # 7: lowercased names in the SQLite object store
+        # 10: versions removed
+        "env_version": 10,
+    }
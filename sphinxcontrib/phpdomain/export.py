@@ -0,0 +1,143 @@
+"""
+Export of the documented PHP symbols as newline-delimited JSON.
+
+The ``phpsymbols`` builder writes one JSON object per line to
+``php-symbols.ndjson``, for each namespace and object of the PHP domain.
+Records are written while documents are processed, so the export of large
+references needs no more memory than a single document.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import json
+
+from sphinx import addnodes
+from sphinx.builders import Builder
+from sphinx.locale import __
+
+from .resolver import NS
+from .signature import parse_signature
+
+CLASSLIKES = ("class", "exception", "interface", "trait", "enum")
+
+
+def _keywords(group):
+    # the regex groups keep the space after the keywords
+    return (group or "").strip() or None
+
+
+def _params(params, optional=False):
+    for param in params:
+        if isinstance(param, tuple):
+            yield from _params(param, True)
+        else:
+            yield {"param": param, "optional": optional}
+
+
+def signature_record(parsed):
+    """
+    Return the JSON record of a parsed signature.
+    """
+    if parsed is None:
+        return None
+    return {
+        "visibility": _keywords(parsed.visibility),
+        "modifiers": _keywords(parsed.modifiers),
+        "name": parsed.name,
+        "params": list(_params(parsed.params or ())),
+        "returns": parsed.retann,
+        "enumtype": parsed.enumtype,
+    }
+
+
+def object_record(docname, objtype, anchor, parsed):
+    """
+    Return the JSON record of a documented object.
+    """
+    owner, sep, member = anchor.rpartition("::")
+    if sep:
+        namespace, _sep, classname = owner.rpartition(NS)
+    else:
+        namespace, _sep, name = anchor.rpartition(NS)
+        if objtype in CLASSLIKES:
+            classname, member = name, None
+        else:
+            classname, member = None, name
+    return {
+        "name": anchor,
+        "namespace": namespace or None,
+        "class": classname,
+        "member": member,
+        "objtype": objtype,
+        "docname": docname,
+        "anchor": anchor,
+        "signature": signature_record(parsed),
+    }
+
+
+class PhpSymbolsBuilder(Builder):
+    """
+    Streams the PHP symbol table to a newline-delimited JSON file.
+    """
+
+    name = "phpsymbols"
+    format = "ndjson"
+    epilog = __("The PHP symbols are in %(outdir)s/php-symbols.ndjson.")
+    allow_parallel = False
+    filename = "php-symbols.ndjson"
+
+    def init(self):
+        self.fp = None
+
+    def get_outdated_docs(self):
+        # the file always lists every document
+        return self.env.found_docs
+
+    def get_target_uri(self, docname, typ=None):
+        return ""
+
+    def prepare_writing(self, docnames):
+        os.makedirs(self.outdir, exist_ok=True)
+        self.path = os.path.join(self.outdir, self.filename)
+        self.fp = open(self.path + ".tmp", "w", encoding="utf-8")
+
+    def write_doc(self, docname, doctree):
+        domain = self.env.get_domain("php")
+        for namespace in sorted(domain.data["docs"].get(docname, ())):
+            record = {
+                "name": namespace,
+                "namespace": namespace,
+                "class": None,
+                "member": None,
+                "objtype": "namespace",
+                "docname": docname,
+                "anchor": "namespace-" + namespace,
+                "signature": None,
+            }
+            self.fp.write(json.dumps(record) + "\n")
+
+        objects = domain.data["objects"]
+        for desc in doctree.findall(addnodes.desc):
+            if desc.get("domain") != "php":
+                continue
+            for signode in desc.children:
+                if not isinstance(signode, addnodes.desc_signature):
+                    continue
+                ids = signode["ids"]
+                if not ids or objects.get(ids[0], ("",))[0] != docname:
+                    continue
+                record = object_record(
+                    docname,
+                    desc["objtype"],
+                    ids[0],
+                    parse_signature(signode.rawsource),
+                )
+                self.fp.write(json.dumps(record) + "\n")
+
+    def finish(self):
+        if self.fp is not None:
+            self.fp.close()
+            os.replace(self.path + ".tmp", self.path)
+            self.fp = None
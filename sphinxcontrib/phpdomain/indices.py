@@ -0,0 +1,127 @@
+"""
+Indices of the PHP classes, functions, methods and constants.
+
+Each index lists the objects of a few object types, read from the per type
+buckets of the object table, grouped by the first letter of their names.
+With ``html_split_index`` enabled the html builder writes one page per
+letter, like it does for the general index, and the index page only links
+to them.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+from sphinx.domains import Index
+from sphinx.locale import _
+
+from .store import split_name
+
+
+class PhpObjectIndex(Index):
+    """
+    Index of the PHP objects of objtypes.
+    """
+
+    objtypes = ()
+    labels = {}  # labels of the objtypes without an ObjType
+    parens = ""
+
+    def generate(self, docnames=None):
+        objects = self.domain.data["objects"]
+        content = {}
+        for objtype in self.objtypes:
+            label = self.labels.get(objtype) or self.domain.object_types[objtype].lname
+            for fullname in objects.names_of(objtype):
+                docname = objects[fullname][0]
+                if docnames and docname not in docnames:
+                    continue
+                prefix, name = split_name(fullname)
+                # the namespace or class the object belongs to
+                owner = prefix[:-2] if prefix.endswith("::") else prefix[:-1]
+                content.setdefault(name[0].lower(), []).append(
+                    [name + self.parens, 0, docname, fullname, owner, "", label]
+                )
+        for entries in content.values():
+            entries.sort(key=lambda entry: (entry[0].lower(), entry[0], entry[4]))
+        return sorted(content.items()), False
+
+
+class PhpClassIndex(PhpObjectIndex):
+    name = "classindex"
+    localname = _("PHP Class Index")
+    shortname = _("classes")
+    objtypes = ("class", "interface", "trait", "enum", "exception")
+
+
+class PhpFunctionIndex(PhpObjectIndex):
+    name = "functionindex"
+    localname = _("PHP Function Index")
+    shortname = _("functions")
+    objtypes = ("function",)
+    parens = "()"
+
+
+class PhpMethodIndex(PhpObjectIndex):
+    name = "methodindex"
+    localname = _("PHP Method Index")
+    shortname = _("methods")
+    objtypes = ("method", "staticmethod")
+    labels = {"staticmethod": _("static method")}
+    parens = "()"
+
+
+class PhpConstantIndex(PhpObjectIndex):
+    name = "constantindex"
+    localname = _("PHP Constant Index")
+    shortname = _("constants")
+    objtypes = ("const", "case")
+
+
+def _split_indices(app):
+    builder = app.builder
+    if builder.format != "html" or not app.config.html_split_index:
+        return []
+    return [
+        (index_name, index_cls, content)
+        for index_name, index_cls, content, _collapse in getattr(
+            builder, "domain_indices", ()
+        )
+        if issubclass(index_cls, PhpObjectIndex)
+    ]
+
+
+def collect_letter_pages(app):
+    """
+    Yield a page for every letter of the split PHP object indices.
+    """
+    for index_name, index_cls, content in _split_indices(app):
+        for letter, entries in content:
+            context = {
+                "indextitle": "%s: %s" % (index_cls.localname, letter.upper()),
+                "content": [(letter, entries)],
+                "collapse_index": False,
+            }
+            yield "%s-%s" % (index_name, letter), context, "domainindex.html"
+
+
+def link_letter_pages(app, pagename, templatename, context, doctree):
+    """
+    Replace the entries of a split PHP object index by its letter pages.
+    """
+    if templatename != "domainindex.html":
+        return
+    for index_name, _index_cls, content in _split_indices(app):
+        if pagename == index_name:
+            context["content"] = [
+                (letter, [_letter_page_entry(index_name, letter, entries)])
+                for letter, entries in content
+            ]
+
+
+def _letter_page_entry(index_name, letter, entries):
+    first, last = entries[0][0], entries[-1][0]
+    if len(entries) == 1:
+        name, description = first, _("1 entry")
+    else:
+        name, description = "%s – %s" % (first, last), _("%d entries") % len(entries)
+    return [name, 0, "%s-%s" % (index_name, letter), "", "", "", description]
@@ -0,0 +1,138 @@
+"""
+Resolution of PHP references against intersphinx inventories.
+
+Sphinx's intersphinx extension only matches the reference target literally,
+so references relying on the current namespace or class, like ``Client`` or
+``::send()`` inside ``Vendor\\Http\\Client``, are missed. The ``php:*``
+entries of every loaded inventory are indexed with the same resolution table
+as the domain, and missing PHP references are resolved against them before
+intersphinx sees them.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+from docutils import nodes
+
+from sphinx.locale import _
+
+from .resolver import PhpResolver
+
+
+def _inventory_item(item):
+    """
+    Return (project, version, uri, dispname) of an inventory entry.
+    """
+    if hasattr(item, "uri"):
+        return item.project_name, item.project_version, item.uri, item.display_name
+    return tuple(item)
+
+
+class PhpInventory:
+    """
+    Index of the PHP objects and namespaces of one intersphinx inventory.
+    """
+
+    def __init__(self, name, inventory):
+        self.name = name
+        self.objects = {}  # fullname -> inventory entry
+        self.namespaces = {}  # namespace -> inventory entry
+        for objtype, entries in inventory.items():
+            if objtype == "php:namespace":
+                self.namespaces.update(entries)
+            elif objtype.startswith("php:"):
+                for fullname, item in entries.items():
+                    self.objects.setdefault(fullname, item)
+        self.resolver = PhpResolver(self.objects)
+
+    def __len__(self):
+        return len(self.objects) + len(self.namespaces)
+
+    def find(self, namespace, classname, target, type, searchorder=0):
+        """
+        Return the inventory entry "target" refers to, or None.
+        """
+        if type == "ns" or type == "obj" and target in self.namespaces:
+            return self.namespaces.get(target)
+        fullname = self.resolver.resolve(
+            namespace, classname, target, type, searchorder
+        )
+        return fullname and self.objects[fullname]
+
+
+def load_inventories(app):
+    """
+    Index the PHP entries of the inventories loaded by intersphinx.
+    """
+    named = getattr(app.env, "intersphinx_named_inventory", None) or {}
+    inventories = [PhpInventory(name, inv) for name, inv in named.items()]
+    app.env.get_domain("php").inventories = [inv for inv in inventories if inv]
+
+
+def _make_refnode(inv_name, item, node, contnode):
+    project, version, uri, dispname = _inventory_item(item)
+    if "://" not in uri and node.get("refdoc"):
+        # inventory URIs are relative to the root of the output
+        uri = "../" * node["refdoc"].count("/") + uri
+    if version:
+        if version[0].isdigit():
+            version = "v" + version
+        reftitle = _("(in %s %s)") % (project, version)
+    else:
+        reftitle = _("(in %s)") % (project,)
+
+    newnode = nodes.reference("", "", internal=False, refuri=uri, reftitle=reftitle)
+    if node.get("refexplicit"):
+        newnode.append(contnode)
+    elif dispname == "-":
+        title = contnode.astext()
+        if inv_name is not None and title.startswith(inv_name + ":"):
+            title = title[len(inv_name) + 1 :]
+            contnode = contnode.__class__(title, title)
+        newnode.append(contnode)
+    else:
+        newnode.append(contnode.__class__(dispname, dispname))
+    return newnode
+
+
+def missing_reference(app, env, node, contnode):
+    """
+    Resolve a PHP reference missing from the documentation in the inventories.
+    """
+    if node.get("refdomain") != "php":
+        return None
+    domain = env.get_domain("php")
+    inventories = domain.inventories
+    if not inventories:
+        return None
+
+    typ = node["reftype"]
+    target = node["reftarget"]
+    inv_name = None
+    name, sep, rest = target.partition(":")
+    if sep and not rest.startswith(":"):
+        # an explicit "inventory:target", but not a "Class::member"
+        inventories = [inv for inv in inventories if inv.name == name]
+        if not inventories:
+            return None
+        inv_name, target = name, rest
+    else:
+        disabled = getattr(app.config, "intersphinx_disabled_reftypes", ())
+        if "*" in disabled or "php:*" in disabled or "php:" + typ in disabled:
+            return None
+
+    if target[-2:] == "()":
+        target = target[:-2]
+    if not target:
+        return None
+    namespace = node.get("php:namespace")
+    classname = node.get("php:class")
+    searchorder = node.hasattr("refspecific") and 1 or 0
+    expanded = domain.expand_name(node.get("refdoc"), namespace, target)
+    for inventory in inventories:
+        item = expanded and inventory.find(None, None, expanded, typ)
+        if not item:
+            item = inventory.find(namespace, classname, target, typ, searchorder)
+        if item:
+            return _make_refnode(inv_name, item, node, contnode)
+    return None
@@ -0,0 +1,146 @@
+"""
+Bulk declaration of the members of a PHP class.
+
+Generated API pages list hundreds of members per class, and every
+``php:method`` or ``php:attr`` directive is matched, has its options and
+indented block parsed and is instantiated on its own. The ``php:members``
+directive takes the members as a compact table, or reads them from a JSON
+file, and describes them all in one pass: a single directive instance of
+each member kind runs once per member of that kind, with the member's
+signature as its argument and its summary as its content. The nodes are the
+ones the member directives produce, so anchors, index entries and
+references are the same.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import json
+
+from docutils.parsers.rst import directives, Directive
+from docutils.statemachine import StringList
+
+from .diagnostics import log_warning
+
+# the member directives php:members describes
+MEMBER_KINDS = ("method", "staticmethod", "attr", "const", "case")
+
+
+def parse_rows(lines):
+    """
+    Yield (index of the line, kind, signature, summary) for each member of a
+    table: a line holding the member kind and its signature as written in
+    the member directive, followed by the summary on indented lines.
+    """
+    row = None
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        if line[:1].isspace() and row is not None:
+            row[3].append(line.strip())
+            continue
+        if row is not None:
+            yield row[0], row[1], row[2], " ".join(row[3])
+        kind, _sep, signature = line.strip().partition(" ")
+        row = (i, kind, signature.strip(), [])
+    if row is not None:
+        yield row[0], row[1], row[2], " ".join(row[3])
+
+
+def read_rows(path):
+    """
+    Yield (None, kind, signature, summary) for each member of a JSON file, a
+    list of objects with a ``kind``, a ``signature`` and optionally a
+    ``visibility`` and a ``summary``.
+    """
+    with open(path, encoding="utf-8") as fp:
+        members = json.load(fp)
+    for member in members:
+        try:
+            kind, signature = member["kind"], member["signature"]
+        except (KeyError, TypeError):
+            raise ValueError(f"{path}: not a member: {member!r}") from None
+        if member.get("visibility"):
+            signature = "%s %s" % (member["visibility"], signature)
+        yield None, kind, signature, member.get("summary", "")
+
+
+class PhpMembers(Directive):
+    """
+    Describe many members of the current class at once.
+    """
+
+    has_content = True
+    required_arguments = 0
+    optional_arguments = 1
+    final_argument_whitespace = True
+    option_spec = {
+        "noindex": directives.flag,
+        "noindexentry": directives.flag,
+        "nocontentsentry": directives.flag,
+    }
+
+    def rows(self):
+        if self.arguments:
+            env = self.state.document.settings.env
+            relpath, path = env.relfn2path(self.arguments[0], env.docname)
+            env.note_dependency(relpath)
+            yield from read_rows(path)
+        yield from parse_rows(self.content)
+
+    def run(self):
+        env = self.state.document.settings.env
+        try:
+            rows = list(self.rows())
+        except (OSError, ValueError) as err:
+            log_warning((env.docname, self.lineno), f"cannot read PHP members: {err}")
+            return []
+
+        domain = env.get_domain("php")
+        describers = {}
+        result = []
+        for index, kind, signature, summary in rows:
+            if index is None:
+                lineno = self.lineno
+            else:
+                lineno = self.content_offset + index + 1
+            if kind not in MEMBER_KINDS:
+                log_warning(
+                    (env.docname, lineno),
+                    f"unknown member kind {kind!r}, expected one of "
+                    f"{', '.join(MEMBER_KINDS)}",
+                )
+                continue
+            describer = describers.get(kind)
+            if describer is None:
+                describer = describers[kind] = self.describer(domain, kind)
+            result.extend(describe(describer, signature, summary, lineno))
+        return result
+
+    def describer(self, domain, kind):
+        """
+        Return the directive of kind describing the members of that kind.
+        """
+        return domain.directive(kind)(
+            "php:" + kind,
+            [],
+            dict(self.options),
+            StringList(),
+            self.lineno,
+            self.content_offset,
+            self.block_text,
+            self.state,
+            self.state_machine,
+        )
+
+
+def describe(directive, sig, summary, lineno):
+    """
+    Return the nodes of a member described by directive, which runs as if
+    it was written for the member, with the summary as its content.
+    """
+    source = directive.state_machine.get_source_and_line(lineno)[0]
+    directive.arguments = [sig]
+    directive.content = StringList([summary] if summary else [], source)
+    directive.lineno = directive.content_offset = lineno
+    return directive.run()
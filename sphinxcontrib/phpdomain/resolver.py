@@ -0,0 +1,315 @@
+"""
+Name resolution for PHP object references.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import re
+import itertools
+
+from .store import split_name
+
+NS = "\\"
+
+# the object types PHP looks up in any case, the names of properties,
+# constants, enum cases and variables are case-sensitive
+case_insensitive_types = frozenset(
+    (
+        "class",
+        "interface",
+        "trait",
+        "enum",
+        "exception",
+        "function",
+        "method",
+        "staticmethod",
+    )
+)
+
+# positions in a fullname right after a namespace or class separator
+php_name_boundary = re.compile(r"^|(?<=\\)|(?<=::)|(?<=::\$)")
+
+
+def _prefix_trie(prefixes):
+    """
+    Build a character trie of prefixes, the "" key marks a complete prefix.
+    """
+    trie = {}
+    for prefix in prefixes:
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[""] = prefix
+    return trie
+
+
+def _longest_prefix(trie, name):
+    """
+    Return the longest prefix in trie that name starts with, or "".
+    """
+    match = ""
+    node = trie
+    for char in name:
+        node = node.get(char)
+        if node is None:
+            break
+        match = node.get("", match)
+    return match
+
+
+def _matching_prefixes(trie, name):
+    """
+    Return the prefixes in trie that name starts with, longest first.
+    """
+    matches = []
+    node = trie
+    for char in name:
+        node = node.get(char)
+        if node is None:
+            break
+        if "" in node:
+            matches.append(node[""])
+    matches.reverse()
+    return tuple(matches)
+
+
+class _Probe:
+    """
+    Stands in for the prefixes of name when the objects are not indexed,
+    checking every candidate prefix against the object table.
+    """
+
+    def __init__(self, objects, name):
+        self.objects = objects
+        self.name = name
+
+    def __bool__(self):
+        return True
+
+    def __contains__(self, prefix):
+        return prefix + self.name in self.objects
+
+
+class PhpResolver:
+    """
+    Resolution table for PHP object names.
+
+    Every object is indexed under each name it can be referenced by together
+    with the namespace/class prefix that completes it, so a reference is
+    resolved by looking up the target once and checking the candidate
+    prefixes in search order. Results are memoized per lookup context.
+
+    Names missing from the current namespace are looked up in its parent
+    namespaces, nearest first. The known namespaces are kept in a trie so
+    the parents of a namespace are found in a single walk over its name.
+
+    Members a class does not declare itself are looked up in the classes of
+    its linearization: its traits, its parent class and that one's
+    ancestors, then its interfaces.
+
+    Object tables that are not held in memory are not indexed, every
+    candidate is looked up in the table instead.
+
+    With casefold, names missing in their case are looked up again in the
+    index of lowercased names of the object table, which only matches the
+    whole name of classes, functions and methods.
+    """
+
+    def __init__(self, objects, hierarchy=None, namespaces=(), casefold=False):
+        self.objects = objects
+        self.casefold = casefold
+        self.hierarchy = hierarchy or {}  # class -> (extends, implements, uses)
+        self.linearizations = {}
+        self.prefixes = {}  # name -> set of prefixes, None when not indexed
+        spaces = {namespace + NS for namespace in namespaces}
+        if not getattr(objects, "in_memory", True):
+            self.prefixes = None
+            for prefix in objects.prefixes():
+                pos = prefix.find(NS)
+                while pos >= 0:
+                    spaces.add(prefix[: pos + 1])
+                    pos = prefix.find(NS, pos + 1)
+        else:
+            for fullname in objects:
+                for m in php_name_boundary.finditer(fullname):
+                    pos = m.start()
+                    prefix = fullname[:pos]
+                    self.prefixes.setdefault(fullname[pos:], set()).add(prefix)
+                    if prefix[-1:] == NS:
+                        spaces.add(prefix)
+        self.namespaces = _prefix_trie(spaces)
+        self.parents = {}  # namespace -> prefixes of its parent namespaces
+        self.memo = {}  # lookup context -> (fullname, branch)
+        self.last_branch = None
+
+    def resolve(self, namespace, classname, name, type, searchorder=0):
+        """
+        Return the fullname "name" refers to, or None.
+
+        The kind of match is left in last_branch for the profiler.
+        """
+        object_method = type in ("func", "meth")
+        key = (namespace, classname, name, object_method, searchorder)
+        try:
+            newname, self.last_branch = self.memo[key]
+            return newname
+        except KeyError:
+            pass
+
+        newname = branch = None
+        if self.prefixes is None:
+            prefixes = _Probe(self.objects, name)
+        else:
+            prefixes = self.prefixes.get(name)
+        if prefixes:
+            for branch, prefix in self.candidates(
+                namespace, classname, name, object_method, searchorder
+            ):
+                if prefix in prefixes:
+                    newname = prefix + name
+                    break
+            else:
+                branch = None
+            if newname is None and namespace:
+                for prefix in self.parent_prefixes(namespace):
+                    if prefix in prefixes:
+                        newname, branch = prefix + name, "parent\\name"
+                        break
+        if newname is None and self.casefold:
+            newname, branch = self.resolve_casefolded(
+                namespace, classname, name, object_method, searchorder
+            )
+        if newname is None and self.hierarchy:
+            newname = self.resolve_inherited(namespace, classname, name)
+            branch = newname and "inherited"
+        self.memo[key] = newname, branch
+        self.last_branch = branch
+        return newname
+
+    def resolve_casefolded(
+        self, namespace, classname, name, object_method, searchorder
+    ):
+        """
+        Return (fullname, branch) of the object "name" refers to in any case,
+        or (None, None).
+        """
+        candidates = self.candidates(
+            namespace, classname, name, object_method, searchorder
+        )
+        if namespace:
+            parents = self.parent_prefixes(namespace)
+            candidates = itertools.chain(
+                candidates, (("parent\\name", prefix) for prefix in parents)
+            )
+        for branch, prefix in candidates:
+            fullname = self.find_casefolded(prefix + name)
+            if fullname is not None:
+                return fullname, "casefold:" + branch
+        return None, None
+
+    def find_casefolded(self, fullname):
+        """
+        Return the name of the object fullname refers to in any case, or None.
+        """
+        member = split_name(fullname)[1]
+        for found, objtype in self.objects.casefolded(fullname):
+            if objtype in case_insensitive_types or split_name(found)[1] == member:
+                return found
+        return None
+
+    def find(self, fullname):
+        """
+        Return the name of the object fullname refers to, or None.
+        """
+        if fullname in self.objects:
+            return fullname
+        if self.casefold:
+            return self.find_casefolded(fullname)
+        return None
+
+    def parent_prefixes(self, namespace):
+        """
+        Return the known parent namespaces of namespace, nearest first, with
+        a trailing separator.
+        """
+        parents = self.parents.get(namespace)
+        if parents is None:
+            parents = self.parents[namespace] = _matching_prefixes(
+                self.namespaces, namespace
+            )
+        return parents
+
+    def resolve_inherited(self, namespace, classname, name):
+        """
+        Return the fullname of the member "name" inherits from, or None.
+
+        "name" is either a "Class::member" or a member of the current class.
+        """
+        owner, sep, member = name.rpartition("::")
+        if sep:
+            owner = self.resolve(namespace, None, owner, "class", 1)
+        elif classname:
+            owner = self.resolve(namespace, None, classname, "class", 1)
+            member = name
+        if not owner or owner not in self.hierarchy:
+            return None
+        member = member.lstrip("$")
+        for ancestor in self.linearize(owner)[1:]:
+            for fullname in (ancestor + "::" + member, ancestor + "::$" + member):
+                fullname = self.find(fullname)
+                if fullname is not None:
+                    return fullname
+        return None
+
+    def linearize(self, fullname):
+        """
+        Return the tuple of fullname and the classes it inherits from, nearest
+        first, without duplicates.
+        """
+        linearization = self.linearizations.get(fullname)
+        if linearization is not None:
+            return linearization
+        # guards against inheritance cycles
+        self.linearizations[fullname] = (fullname,)
+        namespace = fullname.rpartition(NS)[0] or None
+        extends, implements, uses = self.hierarchy.get(fullname, ((), (), ()))
+        seen = {fullname: None}
+        for parent in (*uses, *extends, *implements):
+            if parent.startswith(NS):
+                parent = parent[1:]
+            else:
+                parent = self.resolve(namespace, None, parent, "class", 1) or parent
+            for ancestor in self.linearize(parent):
+                seen.setdefault(ancestor)
+        linearization = self.linearizations[fullname] = tuple(seen)
+        return linearization
+
+    @staticmethod
+    def candidates(namespace, classname, name, object_method, searchorder):
+        """
+        Yield (branch, prefix) for every prefix completing "name", in search
+        order. The branch labels the shape of the candidate.
+        """
+        if searchorder == 1:
+            if namespace and classname:
+                yield "namespace\\class::name", namespace + NS + classname + "::"
+            if namespace:
+                yield "namespace\\name", namespace + NS
+            if classname:
+                yield "class::name", classname + "::"
+                yield "class::$name", classname + "::$"
+            yield "name", ""
+        else:
+            yield "name", ""
+            if classname:
+                yield "class::name", classname + "::"
+                yield "class::$name", classname + "::$"
+            if namespace:
+                yield "namespace\\name", namespace + NS
+            if namespace and classname:
+                yield "namespace\\class::name", namespace + NS + classname + "::"
+                yield "namespace\\class::$name", namespace + NS + classname + "::$"
+            # special case: object methods
+            if object_method and "::" not in name:
+                yield "object::name", "object::"
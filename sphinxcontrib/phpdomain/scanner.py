@@ -0,0 +1,137 @@
+"""
+Parallel scanning of PHP source trees.
+
+Before documents are read, the files below ``php_source_roots`` are parsed
+across a process pool. Each worker fills the autodoc source cache and sends
+back a compact symbol table, which lets :rst:dir:`php:autoclass` and
+:rst:dir:`php:automodule` find declarations by name. Files that cannot be
+read or parsed are reported and left out of the table. Documents using a
+namespace of the table are read again when the files declaring it change.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from sphinx.util import logging
+
+from .autodoc import CLASSLIKES, PhpParseError, PhpSourceCache, get_source_cache
+
+logger = logging.getLogger(__name__)
+
+# below this many files per worker the pool costs more than it saves
+MIN_FILES_PER_JOB = 16
+
+
+def find_sources(roots):
+    """
+    Return the sorted paths of the PHP files below roots.
+    """
+    paths = []
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            paths.extend(
+                os.path.join(dirpath, filename)
+                for filename in filenames
+                if filename.endswith(".php")
+            )
+    return sorted(paths)
+
+
+def scan_file(path, cache_dir):
+    """
+    Parse path and return (path, symbols, error), the symbols as (kind,
+    namespace, name) tuples, or the error message if path cannot be parsed.
+    """
+    cache = PhpSourceCache(cache_dir)
+    try:
+        declarations = cache.get(path)
+    except (OSError, PhpParseError) as err:
+        return path, [], str(err)
+    return (
+        path,
+        [
+            (decl["kind"], decl["namespace"], decl["name"])
+            for decl in declarations
+            if decl["kind"] in CLASSLIKES or decl["kind"] == "function"
+        ],
+        None,
+    )
+
+
+def _scan_chunk(paths, cache_dir):
+    return [scan_file(path, cache_dir) for path in paths]
+
+
+def scan_sources(paths, cache_dir, jobs):
+    """
+    Yield (path, symbols, error) for every path, using up to jobs processes.
+    """
+    jobs = min(jobs, len(paths) // MIN_FILES_PER_JOB)
+    if jobs <= 1:
+        yield from _scan_chunk(paths, cache_dir)
+        return
+
+    # a few chunks per worker keeps them busy without much IPC overhead
+    size = max(MIN_FILES_PER_JOB, len(paths) // (jobs * 4))
+    chunks = [paths[i : i + size] for i in range(0, len(paths), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for results in executor.map(_scan_chunk, chunks, [cache_dir] * len(chunks)):
+            yield from results
+
+
+def build_symbol_table(app):
+    """
+    Scan the configured source roots into the domain's symbol table.
+    """
+    env = app.env
+    domain = env.get_domain("php")
+    previous = domain.data.pop("source_namespaces", {})
+    domain.data.pop("sources", None)
+    roots = app.config.php_source_roots
+    if not roots:
+        domain.changed_source_namespaces = set(previous)
+        return
+    roots = [os.path.join(app.srcdir, root) for root in roots]
+    paths = find_sources(roots)
+    jobs = app.config.php_source_jobs or os.cpu_count() or 1
+    cache = get_source_cache(env)
+
+    symbols = {}  # qualified name -> (kind, path)
+    namespaces = {}  # namespace -> list of paths
+    for path, declarations, error in scan_sources(paths, cache.directory, jobs):
+        if error is not None:
+            logger.warning("[phpdomain] skipped PHP source: %s", error)
+        for kind, namespace, name in declarations:
+            qualified = namespace + "\\" + name if namespace else name
+            symbols[qualified] = (kind, path)
+            files = namespaces.setdefault(namespace, [])
+            if not files or files[-1] != path:
+                files.append(path)
+
+    domain.data["sources"] = symbols
+    domain.data["source_namespaces"] = namespaces
+    domain.changed_source_namespaces = {
+        namespace
+        for namespace in previous.keys() | namespaces.keys()
+        if previous.get(namespace) != namespaces.get(namespace)
+    }
+    logger.info(
+        "[phpdomain] scanned %d PHP files, %d symbols", len(paths), len(symbols)
+    )
+
+
+def outdated_sources(app, env, added, changed, removed):
+    """
+    Return the documents of the scanned namespaces whose files changed.
+    """
+    domain = env.get_domain("php")
+    namespaces = domain.changed_source_namespaces
+    return [
+        docname
+        for docname, used in domain.data["source_users"].items()
+        if used & namespaces and docname not in removed
+    ]
@@ -0,0 +1,103 @@
+"""
+Sharded search index of the PHP symbols.
+
+With ``php_search_index`` enabled, PHP objects are left out of Sphinx's
+``searchindex.js`` and written to ``_static/php-search/`` instead: a manifest
+with the document URIs and object types, and one shard per first letter of
+the symbols' short names. ``php-search.js`` loads the manifest and the shard
+of the searched name only, and lists the matching symbols on the search page.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import json
+import shutil
+
+from sphinx.util.fileutil import copy_asset_file
+
+from .symbols import short_name
+
+SCRIPT = "php-search.js"
+INDEX_DIR = "php-search"
+
+
+def shard_key(token):
+    char = token[:1]
+    return char if char.isascii() and char.isalnum() else "_"
+
+
+def build_shards(domain, get_target_uri):
+    """
+    Return (manifest, {key: {token: [[name, type id, doc id], ...]}}).
+    """
+    namespaces = domain.data["namespaces"]
+    objects = domain.data["objects"]
+    # ids follow the sorted names, the output must not depend on read order
+    docnames = {docname for docname, _synopsis, _deprecated in namespaces.values()}
+    objtypes = {"namespace"}
+    for _fullname, (docname, objtype) in objects.items():
+        docnames.add(docname)
+        objtypes.add(objtype)
+    docs = {docname: i for i, docname in enumerate(sorted(docnames))}
+    types = {objtype: i for i, objtype in enumerate(sorted(objtypes))}
+    shards = {}
+
+    def add(name, objtype, docname):
+        token = short_name(name) or name.lower()
+        shard = shards.setdefault(shard_key(token), {})
+        shard.setdefault(token, []).append([name, types[objtype], docs[docname]])
+
+    for namespace, (docname, _synopsis, _deprecated) in namespaces.items():
+        add(namespace, "namespace", docname)
+    for fullname, (docname, objtype) in objects.items():
+        add(fullname, objtype, docname)
+
+    for shard in shards.values():
+        for entries in shard.values():
+            entries.sort()
+    manifest = {
+        "docs": [get_target_uri(docname) for docname in sorted(docnames)],
+        "types": sorted(objtypes),
+        "shards": {
+            key: sum(len(entries) for entries in shard.values())
+            for key, shard in sorted(shards.items())
+        },
+    }
+    return manifest, shards
+
+
+def _write_script(path, call, *args):
+    with open(path, "w", encoding="utf-8") as fp:
+        arguments = ", ".join(json.dumps(arg, sort_keys=True) for arg in args)
+        fp.write(f"PhpSearch.{call}({arguments});\n")
+
+
+def write_search_index(app, exception):
+    """
+    Write the manifest, shards and script to the static directory.
+    """
+    if exception is not None or not app.config.php_search_index:
+        return
+    if app.builder.format != "html" or not getattr(app.builder, "search", False):
+        return
+    static = os.path.join(app.outdir, "_static")
+    copy_asset_file(os.path.join(os.path.dirname(__file__), "static", SCRIPT), static)
+
+    manifest, shards = build_shards(
+        app.env.get_domain("php"), app.builder.get_target_uri
+    )
+    directory = os.path.join(static, INDEX_DIR)
+    # drop the shards of previous builds
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    _write_script(os.path.join(directory, "manifest.js"), "setManifest", manifest)
+    for key, shard in shards.items():
+        path = os.path.join(directory, "shard-%s.js" % key)
+        _write_script(path, "addShard", key, shard)
+
+
+def add_search_script(app, pagename, templatename, context, doctree):
+    if pagename == "search" and app.config.php_search_index:
+        app.add_js_file(SCRIPT)
@@ -0,0 +1,106 @@
+"""
+Resolution of PHP references against the object stores of other projects.
+
+Projects built with ``php_object_store`` keep their objects in a SQLite
+file. The files listed in ``php_shared_object_stores`` are opened read-only
+and the PHP references missing from the documentation are resolved against
+their objects, with the same resolution table as the domain, linking to the
+pages of the other project under its base URI. The URIs of the pages are the
+ones its HTML build recorded in the store, so the file suffix and the
+directory layout of ``dirhtml`` builds are followed.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import sqlite3
+from urllib.parse import quote
+
+from sphinx.util import logging
+
+from .intersphinx import _make_refnode
+from .resolver import PhpResolver
+from .store import SharedObjectStore
+
+logger = logging.getLogger(__name__)
+
+
+class PhpSharedStore:
+    """
+    Lookups of PHP objects in the store of another project.
+    """
+
+    def __init__(self, name, uri, objects, casefold=False):
+        self.name = name
+        self.uri = uri
+        self.objects = objects
+        self.resolver = PhpResolver(objects, casefold=casefold)
+
+    def find(self, namespace, classname, target, type, searchorder=0):
+        """
+        Return the (project, version, uri, dispname) entry of the object
+        "target" refers to, or None.
+        """
+        fullname = self.resolver.resolve(
+            namespace, classname, target, type, searchorder
+        )
+        if fullname is None:
+            return None
+        page = self.objects.page_uri(fullname)
+        if page is None:
+            # stores written before the pages were recorded
+            page = self.objects[fullname][0] + ".html"
+        # the anchor is the fullname, as in PhpObject.add_target_and_index
+        anchor = quote(fullname, safe=":$")
+        return self.name, "", "%s%s#%s" % (self.uri, page, anchor), "-"
+
+
+def load_shared_stores(app):
+    """
+    Open the object stores of ``php_shared_object_stores``.
+    """
+    domain = app.env.get_domain("php")
+    domain.shared_stores = []
+    for name, (uri, path, *project) in app.config.php_shared_object_stores.items():
+        path = os.path.join(app.confdir, path)
+        try:
+            objects = SharedObjectStore(path, *project)
+        except sqlite3.Error as err:
+            logger.warning(
+                "[phpdomain] cannot open the PHP object store %s: %s", path, err
+            )
+            continue
+        casefold = app.config.php_case_insensitive
+        domain.shared_stores.append(PhpSharedStore(name, uri, objects, casefold))
+
+
+def missing_reference(app, env, node, contnode):
+    """
+    Resolve a PHP reference missing from the documentation in the shared
+    object stores.
+    """
+    if node.get("refdomain") != "php":
+        return None
+    domain = env.get_domain("php")
+    typ = node["reftype"]
+    target = node["reftarget"]
+    # the stores only hold objects, not namespaces
+    if not domain.shared_stores or typ == "ns":
+        return None
+
+    if target[-2:] == "()":
+        target = target[:-2]
+    if not target:
+        return None
+    namespace = node.get("php:namespace")
+    classname = node.get("php:class")
+    searchorder = node.hasattr("refspecific") and 1 or 0
+    expanded = domain.expand_name(node.get("refdoc"), namespace, target)
+    for store in domain.shared_stores:
+        item = expanded and store.find(None, None, expanded, typ)
+        if not item:
+            item = store.find(namespace, classname, target, typ, searchorder)
+        if item:
+            return _make_refnode(None, item, node, contnode)
+    return None
@@ -0,0 +1,160 @@
+"""
+Parsing of PHP signatures.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+php_sig_re = re.compile(
+    r"""
+    ^
+    (public\ |protected\ |private\ )? # visibility
+    (final\ |abstract\ |static\ )?    # modifiers
+    ((?:\\?(?!\d)\w+)\:\:)?           # class name
+    (\$?(?:\\?(?!\d)\w+)+) \s*        # thing name
+    (?:
+        \((.*)\)                      # optional: arguments
+        (?: \s* -> \s* (.*))?         # return annotation
+    )?
+    (?: \s* : \s* (.*))?              # backed enum type / case value
+    $                                 # and nothing more
+    """,
+    re.VERBOSE,
+)
+
+
+PhpSignature = namedtuple(
+    "PhpSignature",
+    "visibility modifiers name_prefix name arglist retann enumtype params",
+)
+PhpSignature.__doc__ = """
+Parsed form of a PHP signature, shared by every directive using it.
+
+``params`` is the parsed argument list as nested tuples, see
+:func:`parse_arglist`, or None when the signature has no arguments.
+"""
+
+# number of distinct signatures and argument lists kept parsed
+SIGNATURE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def parse_signature(sig):
+    """
+    Parse a PHP signature, returns a PhpSignature or None if it is invalid.
+    """
+    m = php_sig_re.match(sig)
+    if m is None:
+        return None
+    groups = m.groups()
+    arglist = groups[4]
+    params = parse_arglist(arglist) if arglist else None
+    return PhpSignature(*groups, params)
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def parse_arglist(arglist):
+    """
+    "Parse" a list of arguments separated by commas.
+    Arguments can have "optional" annotations given by enclosing them in
+    brackets.  Currently, this will split at any comma, even if it's inside a
+    string literal (e.g. default argument value).
+
+    Returns a tuple holding parameter strings and, for optional groups,
+    nested tuples of the same shape. Unbalanced brackets make the whole
+    argument list one parameter.
+
+    The splitting rules come from sphinx.domains.python.
+    """
+    params = []
+    stack = [params]
+    try:
+        for argument in arglist.split(","):
+            argument = argument.strip()
+            ends_open = ends_close = 0
+            while argument.startswith("["):
+                stack.append([])
+                stack[-2].append(stack[-1])
+                argument = argument[1:].strip()
+            while argument.startswith("]"):
+                stack.pop()
+                argument = argument[1:].strip()
+            while argument.endswith("]") and not argument.endswith("[]"):
+                ends_close += 1
+                argument = argument[:-1].strip()
+            while argument.endswith("["):
+                ends_open += 1
+                argument = argument[:-1].strip()
+            if argument:
+                stack[-1].append(argument)
+            while ends_open:
+                stack.append([])
+                stack[-2].append(stack[-1])
+                ends_open -= 1
+            while ends_close:
+                stack.pop()
+                ends_close -= 1
+        if len(stack) != 1:
+            raise IndexError
+    except IndexError:
+        # if there are too few or too many elements on the stack, just give up
+        # and treat the whole argument list as one argument
+        return (arglist,)
+    return _freeze_params(params)
+
+
+# names in types that do not refer to a class: builtin types, the names of
+# the current class and the modifiers of promoted constructor parameters
+php_builtin_types = frozenset("""
+    array bool boolean callable double false float int integer iterable mixed
+    never null number object resource scalar string true void
+    self static parent this
+    public protected private readonly
+    """.split())
+
+php_type_name_re = re.compile(r"(\\?(?!\d)\w+(?:\\(?!\d)\w+)*)")
+
+# a typed parameter: the type, then the variable after some whitespace
+php_param_re = re.compile(r"^(.+?)(\s+(?:&|\.\.\.)*\$.*)$")
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def split_param(param):
+    """
+    Split a parameter after its type, returns (type, rest) or (None, param)
+    for an untyped parameter.
+    """
+    m = php_param_re.match(param)
+    if m is None:
+        return None, param
+    return m.groups()
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def parse_type(text):
+    """
+    Split a PHP type into (text, is_class) parts, the class names of nullable,
+    union, intersection and generic types apart from the rest.
+
+    ``?Foo\\Bar|int`` gives ``(("?", False), ("Foo\\Bar", True), ("|int", False))``.
+    """
+    parts = []
+    for i, part in enumerate(php_type_name_re.split(text)):
+        is_class = i % 2 == 1 and part.lstrip("\\").lower() not in php_builtin_types
+        if not part:
+            continue
+        if not is_class and parts and not parts[-1][1]:
+            parts[-1] = (parts[-1][0] + part, False)
+        else:
+            parts.append((part, is_class))
+    return tuple(parts)
+
+
+def _freeze_params(params):
+    return tuple(
+        param if isinstance(param, str) else _freeze_params(param) for param in params
+    )
@@ -0,0 +1,130 @@
+/*
+ * Search of the sharded PHP symbol index written by sphinxcontrib-phpdomain.
+ *
+ * Symbols are sharded by the first letter of their short name, so a query
+ * only loads the small manifest and the shard of its last name.
+ */
+"use strict";
+
+const PhpSearch = {
+  limit: 50,
+  manifest: null,
+  shards: {},
+  _loading: {},
+
+  root: () => {
+    const contentRoot =
+      document.documentElement.dataset.content_root ??
+      (window.DOCUMENTATION_OPTIONS || {}).URL_ROOT ??
+      "";
+    return contentRoot;
+  },
+
+  // split on namespace and class separators, like the index does
+  tokenize: (query) =>
+    query
+      .toLowerCase()
+      .split(/\\|::|\s+/)
+      .map((token) => token.replace(/^\$/, "").replace(/\(\)$/, ""))
+      .filter((token) => token),
+
+  shardKey: (token) => (/[a-z0-9]/.test(token[0]) ? token[0] : "_"),
+
+  setManifest: (manifest) => {
+    PhpSearch.manifest = manifest;
+  },
+
+  addShard: (key, shard) => {
+    PhpSearch.shards[key] = shard;
+  },
+
+  _load: (name) => {
+    if (!(name in PhpSearch._loading)) {
+      PhpSearch._loading[name] = new Promise((resolve, reject) => {
+        const script = document.createElement("script");
+        script.src = PhpSearch.root() + "_static/php-search/" + name + ".js";
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+      });
+    }
+    return PhpSearch._loading[name];
+  },
+
+  /**
+   * Return the symbols matching query, best matches first. The last name of
+   * the query is matched as a prefix of the symbols' short names, the other
+   * names must appear in their qualified names.
+   */
+  query: async (query) => {
+    const tokens = PhpSearch.tokenize(query);
+    if (!tokens.length) return [];
+    await PhpSearch._load("manifest");
+    const manifest = PhpSearch.manifest;
+    const last = tokens.pop();
+    const key = PhpSearch.shardKey(last);
+    if (!manifest.shards[key]) return [];
+    await PhpSearch._load("shard-" + key);
+
+    const results = [];
+    for (const [token, entries] of Object.entries(PhpSearch.shards[key])) {
+      if (!token.startsWith(last)) continue;
+      for (const [name, type, doc] of entries) {
+        const lower = name.toLowerCase();
+        if (!tokens.every((other) => lower.includes(other))) continue;
+        const objtype = manifest.types[type];
+        const anchor = objtype === "namespace" ? "namespace-" + name : name;
+        results.push({
+          name: name,
+          objtype: objtype,
+          uri: manifest.docs[doc] + "#" + anchor,
+          exact: token === last,
+        });
+      }
+    }
+    results.sort(
+      (a, b) =>
+        b.exact - a.exact ||
+        a.name.length - b.name.length ||
+        (a.name < b.name ? -1 : a.name > b.name ? 1 : 0),
+    );
+    return results.slice(0, PhpSearch.limit);
+  },
+
+  /**
+   * Show the symbols matching the query of the search page above the
+   * regular search results.
+   */
+  render: async () => {
+    const query = new URLSearchParams(window.location.search).get("q");
+    if (!query) return;
+    const results = await PhpSearch.query(query);
+    if (!results.length) return;
+
+    const section = document.createElement("div");
+    section.id = "php-search-results";
+    const title = document.createElement("h2");
+    title.textContent = "PHP symbols";
+    section.appendChild(title);
+    const list = document.createElement("ul");
+    list.className = "search";
+    for (const result of results) {
+      const item = document.createElement("li");
+      const link = document.createElement("a");
+      link.href = PhpSearch.root() + result.uri;
+      link.textContent = result.name;
+      item.appendChild(link);
+      item.appendChild(document.createTextNode(" (PHP " + result.objtype + ")"));
+      list.appendChild(item);
+    }
+    section.appendChild(list);
+
+    const searchResults = document.getElementById("search-results");
+    if (searchResults) searchResults.before(section);
+    else (document.querySelector('[role="main"]') || document.body).appendChild(section);
+  },
+};
+
+if (typeof document !== "undefined") {
+  document.addEventListener("DOMContentLoaded", PhpSearch.render);
+}
@@ -0,0 +1,724 @@
+"""
+Compact storage for the PHP domain data.
+
+Large API references document tens of thousands of objects whose names share
+a handful of namespace and class prefixes, and all of them are defined by a
+few hundred documents. :class:`PhpObjectTable` stores them split on their last
+separator, with docnames and object types interned into small integer ids, so
+the environment pickle and every parallel worker only carry each prefix,
+docname and member name once.
+
+For references too large to keep in memory, :class:`SqliteObjectTable`
+stores the same mapping in a SQLite file instead, see ``php_object_store``.
+Other projects look the objects of such a file up through a
+:class:`SharedObjectStore`, which only opens it read-only.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import sys
+import heapq
+import uuid
+import sqlite3
+import urllib.request
+from collections.abc import Mapping, MutableMapping
+
+# objtype ids are packed into the low bits of an entry, the docname id above
+TYPE_BITS = 8
+TYPE_MASK = (1 << TYPE_BITS) - 1
+
+
+def split_name(fullname):
+    """
+    Split fullname after its last namespace or class separator.
+    """
+    pos = fullname.rfind("::")
+    pos = pos + 2 if pos >= 0 else 0
+    pos = max(pos, fullname.rfind("\\") + 1)
+    return fullname[:pos], fullname[pos:]
+
+
+class PhpObjectTable(MutableMapping):
+    """
+    Mapping of object fullnames to (docname, objtype) tuples.
+
+    Entries live in a ``{prefix: {name: packed ids}}`` dictionary, the tuples
+    are only built when an entry is read. Indices of the names defined by
+    each document, of the names of each object type and of the lowercased
+    names are kept in memory for clearing documents, building the domain
+    indices and resolving names in any case, they are not pickled and built
+    again on demand. The table of a parallel worker also pickles the names
+    of the documents it read, so merging it does not index the whole table.
+    """
+
+    def __init__(self, items=()):
+        self._docnames = []  # docname id -> docname
+        self._objtypes = []  # objtype id -> objtype
+        self._entries = {}  # prefix -> {name: docname id << TYPE_BITS | objtype id}
+        self._reset()
+        self.update(items)
+
+    def _reset(self):
+        self._docids = {docname: i for i, docname in enumerate(self._docnames)}
+        self._typeids = {objtype: i for i, objtype in enumerate(self._objtypes)}
+        self._packed = {}  # shares the int objects of identical entries
+        self._by_doc = None  # docname id -> {(prefix, name): None} in insertion order
+        self._by_type = None  # objtype id -> {(prefix, name): None}
+        self._by_fold = None  # lowercased fullname -> {(prefix, name): None}
+        self._len = sum(len(names) for names in self._entries.values())
+        self._owner = os.getpid()
+        self._written = {}  # docname id -> {(prefix, name): None} set by a worker
+        # docname id -> [(prefix, name)] of a table unpickled from a worker
+        self._shipped = None
+
+    def __getstate__(self):
+        written = None
+        if self._owner != os.getpid():
+            written = {docid: list(keys) for docid, keys in self._written.items()}
+        return self._docnames, self._objtypes, self._entries, written
+
+    def __setstate__(self, state):
+        self._docnames, self._objtypes, self._entries, written = state
+        self._reset()
+        self._shipped = written
+
+    def _intern(self, table, ids, value):
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(table)
+            table.append(value)
+        return index
+
+    def _pack(self, docname, objtype):
+        typeid = self._intern(self._objtypes, self._typeids, objtype)
+        if typeid >> TYPE_BITS:
+            raise ValueError("too many PHP object types")
+        packed = self._intern(self._docnames, self._docids, docname)
+        packed = packed << TYPE_BITS | typeid
+        return self._packed.setdefault(packed, packed)
+
+    def _unpack(self, packed):
+        return (
+            self._docnames[packed >> TYPE_BITS],
+            self._objtypes[packed & TYPE_MASK],
+        )
+
+    def _doc_index(self):
+        if self._by_doc is None:
+            self._by_doc = {}
+            for prefix, names in self._entries.items():
+                for name, packed in names.items():
+                    key = (prefix, name)
+                    self._by_doc.setdefault(packed >> TYPE_BITS, {})[key] = None
+        return self._by_doc
+
+    def _type_index(self):
+        if self._by_type is None:
+            self._by_type = {}
+            for prefix, names in self._entries.items():
+                for name, packed in names.items():
+                    key = (prefix, name)
+                    self._by_type.setdefault(packed & TYPE_MASK, {})[key] = None
+        return self._by_type
+
+    def _fold_index(self):
+        if self._by_fold is None:
+            self._by_fold = {}
+            for prefix, names in self._entries.items():
+                for name in names:
+                    key = (prefix, name)
+                    self._by_fold.setdefault((prefix + name).lower(), {})[key] = None
+        return self._by_fold
+
+    def _unfold(self, key):
+        folded = "".join(key).lower()
+        keys = self._by_fold.get(folded, {})
+        keys.pop(key, None)
+        if not keys:
+            self._by_fold.pop(folded, None)
+
+    def _unindex(self, key, packed):
+        if self._written:
+            self._written.get(packed >> TYPE_BITS, {}).pop(key, None)
+        if self._by_doc is not None:
+            self._by_doc[packed >> TYPE_BITS].pop(key, None)
+        if self._by_type is not None:
+            self._by_type[packed & TYPE_MASK].pop(key, None)
+        if self._by_fold is not None:
+            self._unfold(key)
+
+    def __getitem__(self, fullname):
+        prefix, name = split_name(fullname)
+        try:
+            return self._unpack(self._entries[prefix][name])
+        except KeyError:
+            raise KeyError(fullname) from None
+
+    def __contains__(self, fullname):
+        prefix, name = split_name(fullname)
+        return name in self._entries.get(prefix, ())
+
+    def __setitem__(self, fullname, value):
+        prefix, name = map(sys.intern, split_name(fullname))
+        packed = self._pack(*value)
+        self._shipped = None
+        names = self._entries.setdefault(prefix, {})
+        old = names.get(name)
+        names[name] = packed
+        if old is None:
+            self._len += 1
+        else:
+            self._unindex((prefix, name), old)
+        if self._owner != os.getpid():
+            self._written.setdefault(packed >> TYPE_BITS, {})[prefix, name] = None
+        if self._by_doc is not None:
+            self._by_doc.setdefault(packed >> TYPE_BITS, {})[prefix, name] = None
+        if self._by_type is not None:
+            typeid = packed & TYPE_MASK
+            self._by_type.setdefault(typeid, {})[prefix, name] = None
+        if self._by_fold is not None:
+            folded = (prefix + name).lower()
+            self._by_fold.setdefault(folded, {})[prefix, name] = None
+
+    def __delitem__(self, fullname):
+        prefix, name = split_name(fullname)
+        names = self._entries.get(prefix, {})
+        if name not in names:
+            raise KeyError(fullname)
+        packed = names.pop(name)
+        if not names:
+            del self._entries[prefix]
+        self._len -= 1
+        self._shipped = None
+        self._unindex((prefix, name), packed)
+
+    def __iter__(self):
+        for prefix, names in self._entries.items():
+            for name in names:
+                yield prefix + name
+
+    def __len__(self):
+        return self._len
+
+    def items(self):
+        for prefix, names in self._entries.items():
+            for name, packed in names.items():
+                yield prefix + name, self._unpack(packed)
+
+    def names_in(self, docname):
+        """
+        Return the fullnames currently defined by docname.
+        """
+        docid = self._docids.get(docname)
+        if docid is None:
+            return []
+        if self._by_doc is None and self._shipped is not None:
+            # merged from a worker, which only wrote the names of its documents
+            keys = self._shipped.get(docid, ())
+        else:
+            keys = self._doc_index().get(docid, ())
+        return [prefix + name for prefix, name in keys]
+
+    def names_of(self, objtype):
+        """
+        Return the fullnames of the objects of objtype.
+        """
+        typeid = self._typeids.get(objtype)
+        if typeid is None:
+            return []
+        return [prefix + name for prefix, name in self._type_index().get(typeid, ())]
+
+    def casefolded(self, fullname):
+        """
+        Return the (fullname, objtype) of the objects named fullname in any
+        case.
+        """
+        keys = self._fold_index().get(fullname.lower(), ())
+        return [
+            (prefix + name, self._objtypes[self._entries[prefix][name] & TYPE_MASK])
+            for prefix, name in keys
+        ]
+
+    def clear_doc(self, docname):
+        """
+        Remove every object defined by docname.
+        """
+        docid = self._docids.get(docname)
+        if docid is None:
+            return
+        by_type = self._by_type
+        for prefix, name in self._doc_index().pop(docid, ()):
+            names = self._entries[prefix]
+            if by_type is not None:
+                by_type[names[name] & TYPE_MASK].pop((prefix, name), None)
+            if self._by_fold is not None:
+                self._unfold((prefix, name))
+            del names[name]
+            if not names:
+                del self._entries[prefix]
+            self._len -= 1
+
+
+_connections = {}  # (pid, path) -> sqlite3.Connection
+
+
+def _connection(path):
+    """
+    Return the connection of this process to path.
+
+    The tables of one file share a connection, and so its transaction,
+    writing to the file from two connections of a process would deadlock.
+    """
+    key = (os.getpid(), path)
+    db = _connections.get(key)
+    if db is None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = _connections[key] = sqlite3.connect(path, timeout=60)
+        db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class SqliteObjectTable(MutableMapping):
+    """
+    Mapping of object fullnames to (docname, objtype) tuples stored in a
+    SQLite file.
+
+    The rows of every project, keyed by its source directory, live in one
+    ``objects`` table indexed on the fullname, its lowercased form, the
+    docname and the object type, so several projects can share a file. Only
+    the path, the project and a token matching the rows written are pickled.
+
+    Parallel read workers cannot write to the file, the objects they note
+    are kept in an overlay that is pickled back to the main process.
+    """
+
+    in_memory = False
+
+    # files written with an older schema are migrated, see _migrate()
+    schema_version = 2
+    schema = """
+        CREATE TABLE IF NOT EXISTS objects (
+            project TEXT NOT NULL,
+            fullname TEXT NOT NULL,
+            prefix TEXT NOT NULL,
+            folded TEXT NOT NULL,
+            docname TEXT NOT NULL,
+            objtype TEXT NOT NULL,
+            PRIMARY KEY (project, fullname)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS objects_folded ON objects (project, folded);
+        CREATE INDEX IF NOT EXISTS objects_docname ON objects (project, docname);
+        CREATE INDEX IF NOT EXISTS objects_objtype ON objects (project, objtype);
+        CREATE TABLE IF NOT EXISTS projects (
+            project TEXT PRIMARY KEY,
+            token TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            project TEXT NOT NULL,
+            docname TEXT NOT NULL,
+            uri TEXT NOT NULL,
+            PRIMARY KEY (project, docname)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path, project):
+        self.path = path
+        self.project = project
+        self.token = None
+        self._overlay = {}  # fullname -> (docname, objtype), None once deleted
+        self._db = None
+        self._pid = None
+        self._owner = None  # the process writing to the file
+        self.reset()
+
+    def __getstate__(self):
+        self.commit()
+        # the tables of the workers only carry their overlay
+        detached = not self._writable()
+        return self.path, self.project, self.token, self._overlay, detached
+
+    def __setstate__(self, state):
+        self.path, self.project, self.token, self._overlay, detached = state
+        self._db = None
+        self._pid = None
+        self._owner = None if detached else os.getpid()
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            # connections are not shared with forked processes
+            self._db = _connection(self.path)
+            self._pid = os.getpid()
+        return self._db
+
+    def _query(self, sql, *args):
+        return self._connect().execute(sql, (self.project, *args))
+
+    def _writable(self):
+        return self._owner == os.getpid()
+
+    def reset(self):
+        """
+        Remove the rows of the project and start a new token.
+        """
+        db = self._connect()
+        self._owner = os.getpid()
+        self.token = uuid.uuid4().hex
+        # only the writing process creates the tables, creating them takes
+        # the write lock even when they exist
+        db.execute("PRAGMA journal_mode=WAL")
+        version = db.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.schema_version:
+            self._migrate(db, version)
+        db.executescript(self.schema)
+        with db:
+            db.execute("DELETE FROM objects WHERE project = ?", (self.project,))
+            db.execute("DELETE FROM pages WHERE project = ?", (self.project,))
+            db.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?)",
+                (self.project, self.token),
+            )
+
+    def _migrate(self, db, version):
+        """
+        Bring a file written with an older schema up to date, keeping the
+        rows of every project.
+        """
+        if version > self.schema_version:
+            raise ValueError(
+                "%s: the PHP object store was written by a newer version of "
+                "sphinxcontrib-phpdomain" % self.path
+            )
+        tables = {
+            name
+            for (name,) in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        if version == 0 and "objects" in tables:
+            # the first schema had no lowercased names
+            db.create_function("php_lower", 1, str.lower, deterministic=True)
+            with db:
+                db.execute(
+                    "ALTER TABLE objects ADD COLUMN folded TEXT NOT NULL DEFAULT ''"
+                )
+                db.execute("UPDATE objects SET folded = php_lower(fullname)")
+        # the pages table of schema 2 is created with the others
+        db.execute("PRAGMA user_version = %d" % self.schema_version)
+
+    def note_pages(self, uris):
+        """
+        Replace the URIs of the pages of the project, relative to the root of
+        its output, by uris, a {docname: uri} mapping.
+        """
+        with self._connect() as db:
+            db.execute("DELETE FROM pages WHERE project = ?", (self.project,))
+            db.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?)",
+                [(self.project, docname, uri) for docname, uri in uris.items()],
+            )
+
+    def check(self):
+        """
+        Return whether the rows of the file are the ones this table wrote.
+        """
+        try:
+            row = self._query("SELECT token FROM projects WHERE project = ?")
+        except sqlite3.OperationalError:
+            # the tables are gone with the file
+            return False
+        row = row.fetchone()
+        return row is not None and row[0] == self.token
+
+    def commit(self):
+        if self._db is not None and self._writable():
+            self._db.commit()
+
+    def __getitem__(self, fullname):
+        if fullname in self._overlay:
+            value = self._overlay[fullname]
+        else:
+            value = self._query(
+                "SELECT docname, objtype FROM objects "
+                "WHERE project = ? AND fullname = ?",
+                fullname,
+            ).fetchone()
+        if value is None:
+            raise KeyError(fullname)
+        return tuple(value)
+
+    def __contains__(self, fullname):
+        try:
+            self[fullname]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, fullname, value):
+        docname, objtype = value
+        if not self._writable():
+            self._overlay[fullname] = (docname, objtype)
+            return
+        self._query(
+            "INSERT OR REPLACE INTO objects "
+            "(project, fullname, prefix, folded, docname, objtype) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            fullname,
+            split_name(fullname)[0],
+            fullname.lower(),
+            docname,
+            objtype,
+        )
+
+    def __delitem__(self, fullname):
+        if fullname not in self:
+            raise KeyError(fullname)
+        if not self._writable():
+            self._overlay[fullname] = None
+            return
+        self._query("DELETE FROM objects WHERE project = ? AND fullname = ?", fullname)
+
+    def _rows(self, where="", *args):
+        rows = self._query(
+            "SELECT fullname, docname, objtype FROM objects WHERE project = ?"
+            + where
+            + " ORDER BY fullname",
+            *args,
+        )
+        for fullname, docname, objtype in rows:
+            if fullname not in self._overlay:
+                yield fullname, (docname, objtype)
+
+    def _overlay_items(self, index=None, value=None):
+        for fullname, entry in sorted(self._overlay.items()):
+            if entry is not None and (index is None or entry[index] == value):
+                yield fullname, entry
+
+    def __iter__(self):
+        for fullname, _entry in self.items():
+            yield fullname
+
+    def __len__(self):
+        if not self._overlay:
+            return self._query(
+                "SELECT COUNT(*) FROM objects WHERE project = ?"
+            ).fetchone()[0]
+        return sum(1 for _entry in self.items())
+
+    def items(self):
+        """
+        Yield the (fullname, (docname, objtype)) entries, sorted by fullname.
+        """
+        if not self._overlay:
+            return self._rows()
+        return heapq.merge(self._rows(), self._overlay_items())
+
+    def prefixes(self):
+        """
+        Return the namespace and class prefixes of the objects.
+        """
+        prefixes = {
+            prefix
+            for (prefix,) in self._query(
+                "SELECT DISTINCT prefix FROM objects WHERE project = ?"
+            )
+        }
+        prefixes.update(split_name(name)[0] for name, _entry in self._overlay_items())
+        return prefixes
+
+    def names_in(self, docname):
+        """
+        Return the fullnames currently defined by docname.
+        """
+        items = heapq.merge(
+            self._rows(" AND docname = ?", docname), self._overlay_items(0, docname)
+        )
+        return [fullname for fullname, _entry in items]
+
+    def names_of(self, objtype):
+        """
+        Return the fullnames of the objects of objtype.
+        """
+        items = heapq.merge(
+            self._rows(" AND objtype = ?", objtype), self._overlay_items(1, objtype)
+        )
+        return [fullname for fullname, _entry in items]
+
+    def casefolded(self, fullname):
+        """
+        Return the (fullname, objtype) of the objects named fullname in any
+        case.
+        """
+        folded = fullname.lower()
+        found = [
+            (name, objtype)
+            for name, (_docname, objtype) in self._rows(" AND folded = ?", folded)
+        ]
+        found.extend(
+            (name, entry[1])
+            for name, entry in self._overlay_items()
+            if name.lower() == folded
+        )
+        return found
+
+    def clear_doc(self, docname):
+        """
+        Remove every object defined by docname.
+        """
+        for fullname, entry in list(self._overlay.items()):
+            if entry is not None and entry[0] == docname:
+                del self._overlay[fullname]
+        if self._writable():
+            with self._connect() as db:
+                # committed before parallel read workers are forked
+                db.execute(
+                    "DELETE FROM objects WHERE project = ? AND docname = ?",
+                    (self.project, docname),
+                )
+
+
+class SharedObjectStore(Mapping):
+    """
+    Read-only mapping of object fullnames to (docname, objtype) tuples of
+    the projects of a file written by :class:`SqliteObjectTable`.
+
+    The file is opened read-only, so looking objects up never changes or
+    locks the rows of the builds writing it. Without a project, the objects
+    of every project of the file are looked up, in the order of their names.
+    The URIs of the pages are the ones written by the HTML builds of the
+    projects, see :func:`note_page_uris`.
+    """
+
+    in_memory = False
+
+    def __init__(self, path, project=None):
+        self.path = path
+        self._db = None
+        self._pid = None
+        tables = self._connect().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+        # files of schema 1 have no page URIs
+        self.has_pages = "pages" in {name for (name,) in tables}
+        if project is None:
+            rows = self._connect().execute("SELECT project FROM projects")
+            self.projects = sorted(project for (project,) in rows)
+        else:
+            self.projects = [project]
+
+    def _connect(self):
+        if self._pid != os.getpid():
+            # connections are not shared with forked processes
+            url = urllib.request.pathname2url(os.path.abspath(self.path))
+            self._db = sqlite3.connect("file:%s?mode=ro" % url, uri=True)
+            self._pid = os.getpid()
+        return self._db
+
+    def _select(self, sql, *args):
+        """
+        Yield the rows of sql for each project, in the order of the projects.
+        """
+        db = self._connect()
+        for project in self.projects:
+            yield from db.execute(sql, (project, *args))
+
+    def page_uri(self, fullname):
+        """
+        Return the URI of the page documenting fullname, relative to the root
+        of the output of its project, or None when its build did not record
+        the URIs of its pages.
+        """
+        if not self.has_pages:
+            return None
+        for (uri,) in self._select(
+            "SELECT pages.uri FROM objects JOIN pages "
+            "ON pages.project = objects.project AND pages.docname = objects.docname "
+            "WHERE objects.project = ? AND objects.fullname = ?",
+            fullname,
+        ):
+            return uri
+        return None
+
+    def __getitem__(self, fullname):
+        for row in self._select(
+            "SELECT docname, objtype FROM objects WHERE project = ? AND fullname = ?",
+            fullname,
+        ):
+            return tuple(row)
+        raise KeyError(fullname)
+
+    def __iter__(self):
+        rows = self._select(
+            "SELECT fullname FROM objects WHERE project = ? ORDER BY fullname"
+        )
+        return iter(sorted({fullname for (fullname,) in rows}))
+
+    def __len__(self):
+        return sum(1 for _fullname in self)
+
+    def prefixes(self):
+        """
+        Return the namespace and class prefixes of the objects.
+        """
+        rows = self._select("SELECT DISTINCT prefix FROM objects WHERE project = ?")
+        return {prefix for (prefix,) in rows}
+
+    def casefolded(self, fullname):
+        """
+        Return the (fullname, objtype) of the objects named fullname in any
+        case.
+        """
+        found = {}
+        for name, objtype in self._select(
+            "SELECT fullname, objtype FROM objects WHERE project = ? AND folded = ?",
+            fullname.lower(),
+        ):
+            found.setdefault(name, objtype)
+        return list(found.items())
+
+
+def _new_table(path, project):
+    if path:
+        return SqliteObjectTable(path, project)
+    return PhpObjectTable()
+
+
+def _is_current(objects, path):
+    if isinstance(objects, SqliteObjectTable):
+        return objects.path == path and objects.check()
+    return not path
+
+
+def note_page_uris(app, env):
+    """
+    Record the URIs of the pages in the SQLite store, so other projects
+    sharing it link to them.
+    """
+    if getattr(app.builder, "format", None) != "html":
+        return
+    objects = env.get_domain("php").data["objects"]
+    if isinstance(objects, SqliteObjectTable):
+        objects.note_pages(
+            {
+                docname: app.builder.get_target_uri(docname)
+                for docname in sorted(env.found_docs)
+            }
+        )
+
+
+def open_object_store(app, env, docnames):
+    """
+    Switch the objects of the PHP domain to the store selected by the
+    ``php_object_store`` config value.
+
+    Every document is read again when the store changes or no longer holds
+    the objects of the environment.
+    """
+    data = env.get_domain("php").data
+    store = env.config.php_object_store
+    path = store and os.path.join(env.doctreedir, store)
+    if _is_current(data["objects"], path):
+        return
+    data["objects"] = _new_table(path, str(env.srcdir))
+    docnames[:] = sorted(env.found_docs.union(docnames))
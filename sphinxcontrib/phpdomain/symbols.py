@@ -0,0 +1,210 @@
+"""
+Memory-mapped index of the PHP symbols of a built documentation.
+
+When an HTML build finishes, the namespaces and objects of the PHP domain
+are written to ``php-symbols.idx`` in the output directory, with their URIs
+in that output. Tools can then find where a symbol is documented without
+loading the environment::
+
+    python -m sphinxcontrib.phpdomain _build/html 'Vendor\\Http\\Client::send'
+
+The file holds a string heap of records and two sorted tables of offsets
+into it, one by fullname and one by short name. It is only mapped into
+memory and lookups are binary searches, so a query reads a few pages of the
+file whatever its size. This module must not import Sphinx.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+import os
+import re
+import sys
+import mmap
+import bisect
+import struct
+import argparse
+
+FILENAME = "php-symbols.idx"
+MAGIC = b"PHPSYM\x00\x01"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+
+
+def short_name(fullname):
+    """
+    Return the lowercased last name of fullname, the token it is indexed by.
+    """
+    name = re.split(r"\\|::", fullname)[-1]
+    return name.lstrip("$").lower()
+
+
+def write_index(path, records):
+    """
+    Write the records, (fullname, objtype, docname, uri) tuples, to path.
+    """
+    records = sorted(records)
+    heap = bytearray()
+    offsets = []
+    for record in records:
+        offsets.append(len(heap))
+        heap += "\t".join(record).encode("utf-8") + b"\n"
+    by_short = sorted(
+        range(len(records)),
+        key=lambda i: (short_name(records[i][0]), records[i][0]),
+    )
+    with open(path + ".tmp", "wb") as fp:
+        fp.write(HEADER.pack(MAGIC, len(records)))
+        fp.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+        fp.write(b"".join(OFFSET.pack(offsets[i]) for i in by_short))
+        fp.write(heap)
+    # readers keep the previous file mapped
+    os.replace(path + ".tmp", path)
+
+
+def write_symbol_index(app, exception):
+    """
+    Write the symbol index of the PHP domain to the output of an HTML build.
+
+    The URIs depend on the builder, so other builders sharing the doctree
+    directory leave the index of the HTML output alone.
+    """
+    if exception is not None or app.builder.format != "html":
+        return
+    domain = app.env.get_domain("php")
+    get_target_uri = app.builder.get_target_uri
+    records = []
+    for name, _dispname, objtype, docname, anchor, _prio in domain.get_objects():
+        uri = "%s#%s" % (get_target_uri(docname), anchor)
+        records.append((name, objtype, docname, uri))
+    os.makedirs(app.outdir, exist_ok=True)
+    write_index(os.path.join(app.outdir, FILENAME), records)
+
+
+class _Column:
+    """
+    Sequence of the sort keys of one offset table, for bisect.
+    """
+
+    def __init__(self, index, start, key):
+        self.index = index
+        self.start = start
+        self.key = key
+
+    def __len__(self):
+        return self.index.count
+
+    def __getitem__(self, i):
+        return self.key(self.index.fullname(self.index.offset(self.start, i)))
+
+
+class SymbolIndex:
+    """
+    Read access to a symbol index file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as fp:
+            self.data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            self.data.close()
+            raise ValueError("%s is not a PHP symbol index" % path)
+        self.names = HEADER.size
+        self.shorts = self.names + self.count * OFFSET.size
+        self.heap = self.shorts + self.count * OFFSET.size
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def offset(self, table, i):
+        return self.heap + OFFSET.unpack_from(self.data, table + i * OFFSET.size)[0]
+
+    def fullname(self, offset):
+        return self.data[offset : self.data.find(b"\t", offset)].decode("utf-8")
+
+    def record(self, offset):
+        end = self.data.find(b"\n", offset)
+        return tuple(self.data[offset:end].decode("utf-8").split("\t"))
+
+    def _scan(self, table, key, value, prefix):
+        column = _Column(self, table, key)
+        i = bisect.bisect_left(column, value)
+        while i < self.count:
+            offset = self.offset(table, i)
+            found = key(self.fullname(offset))
+            if found != value and not (prefix and found.startswith(value)):
+                break
+            yield self.record(offset)
+            i += 1
+
+    def lookup(self, name, prefix=False):
+        """
+        Yield the records of fullname name, or starting with name.
+        """
+        return self._scan(self.names, lambda fullname: fullname, name, prefix)
+
+    def lookup_short(self, name, prefix=False):
+        """
+        Yield the records whose short name is name, or starts with it.
+        """
+        return self._scan(self.shorts, short_name, short_name(name), prefix)
+
+
+def find_index(path):
+    """
+    Return the index file of path, a file, an HTML output directory or the
+    build directory holding it.
+    """
+    if os.path.isfile(path):
+        return path
+    for directory in ("", "html", "dirhtml"):
+        candidate = os.path.join(path, directory, FILENAME)
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError("no %s found in %s" % (FILENAME, path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m sphinxcontrib.phpdomain",
+        description="Find where PHP symbols are documented in a built "
+        "documentation.",
+    )
+    parser.add_argument(
+        "index", help="symbol index file, or the HTML output or build directory"
+    )
+    parser.add_argument("name", nargs="+", help="fully qualified names to look up")
+    parser.add_argument(
+        "-p", "--prefix", action="store_true", help="match names starting with name"
+    )
+    parser.add_argument(
+        "-s",
+        "--short",
+        action="store_true",
+        help="match the last part of the names, ignoring case",
+    )
+    args = parser.parse_args(argv)
+    try:
+        index = SymbolIndex(find_index(args.index))
+    except (OSError, ValueError) as exc:
+        parser.exit(2, "%s: error: %s\n" % (parser.prog, exc))
+
+    found = False
+    with index:
+        for name in args.name:
+            name = name.lstrip("\\")
+            if args.short:
+                records = index.lookup_short(name, args.prefix)
+            else:
+                records = index.lookup(name, args.prefix)
+            for record in records:
+                found = True
+                sys.stdout.write("\t".join(record) + "\n")
+    return 0 if found else 1
@@ -0,0 +1,49 @@
+"""
+Resolution of the class names in the types of PHP signatures.
+
+Parameter and return types are emitted as pending references flagged with
+``php:type``. A signature can hold several of them and large references
+repeat the same few types in thousands of signatures, so instead of letting
+Sphinx resolve every node on its own, this post-transform groups the type
+references of a document and looks each distinct type up once, memoized by
+the domain for the whole build. Types that are not documented are left to
+the regular resolution, so intersphinx can still find them.
+
+:copyright: Copyright 2016 by Mark Story
+:license: BSD, see LICENSE for details.
+"""
+
+from sphinx import addnodes
+from sphinx.transforms.post_transforms import SphinxPostTransform
+from sphinx.util.nodes import make_refnode
+
+
+class PhpTypeResolver(SphinxPostTransform):
+    """
+    Resolve the type references of PHP signatures, once per distinct type.
+    """
+
+    # before sphinx.transforms.post_transforms.ReferencesResolver
+    default_priority = 5
+
+    def run(self, **kwargs):
+        groups = {}
+        for node in self.document.findall(addnodes.pending_xref):
+            if node.get("php:type"):
+                key = (node["refdoc"], node["php:namespace"], node["reftarget"])
+                groups.setdefault(key, []).append(node)
+        if not groups:
+            return
+        domain = self.env.get_domain("php")
+        builder = self.app.builder
+        fromdocname = self.env.docname
+        for refnodes in groups.values():
+            found = domain.find_type(refnodes[0])
+            if found is None:
+                continue
+            fullname, docname = found
+            for node in refnodes:
+                refnode = make_refnode(
+                    builder, fromdocname, docname, fullname, node[0], fullname
+                )
+                node.replace_self(refnode)
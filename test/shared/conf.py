@@ -0,0 +1,13 @@
+# Resolves PHP references against the object store of the unit tests.
+import sys, os
+
+sys.path.append(os.path.abspath(".."))
+
+extensions = ["sphinxcontrib.phpdomain"]
+php_shared_object_stores = {
+    "unit": ("https://unit.example.com/", "_build/unit/doctrees/php-objects.sqlite"),
+}
+php_case_insensitive = True
+master_doc = "index"
+exclude_patterns = ["_build"]
+html_theme = "default"
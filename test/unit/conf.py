@@ -25,7 +25,19 @@ needs_sphinx = "1.0"
 
 # Add any Sphinx extension module names here, as strings. They can be extensions
 # coming with Sphinx (named 'sphinx.ext.*') or your custom ones.
-extensions = ["sphinxcontrib.phpdomain"]
+extensions = ["sphinx.ext.intersphinx", "sphinxcontrib.phpdomain"]
+
+# a local inventory of an external PHP API
+intersphinx_mapping = {"ext": ("https://api.example.com/", "external.inv")}
+
+# PHP sources scanned for php:autoclass and php:automodule
+php_source_roots = ["php"]
+
+# write the sharded PHP symbol search index
+php_search_index = True
+
+# casing.rst resolves names whatever their case, like PHP does
+php_case_insensitive = True
 
 # Add any paths that contain templates here, relative to this directory.
 templates_path = ["_templates"]
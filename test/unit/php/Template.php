@@ -0,0 +1,58 @@
+<?php
+namespace Autodoc\Fixture;
+
+use InvalidArgumentException;
+
+/**
+ * Renders templates.
+ *
+ * @see Renderable
+ */
+#[SomeAttribute(1, [2, 3])]
+abstract class Template implements Renderable, \Countable
+{
+    use Counts;
+
+    /**
+     * Default extension of template files.
+     */
+    public const EXTENSION = '.php';
+
+    /**
+     * @var array<string, mixed> Variables available to the template.
+     */
+    public array $vars = [];
+
+    private $secret;
+
+    /**
+     * Create a template.
+     *
+     * @param string $path The template path.
+     * @param array $vars Initial variables.
+     * @throws InvalidArgumentException When the path is empty.
+     */
+    public function __construct(public readonly string $path, array $vars = [])
+    {
+        $x = new class { public function inner() {} };
+    }
+
+    /**
+     * Create a template from a string.
+     *
+     * @deprecated 2.0 Use the constructor.
+     */
+    public static function fromString(string $template, ?int &$length = null, string ...$rest): static
+    {
+    }
+
+    /**
+     * Render the template.
+     */
+    abstract public function render(): string;
+
+    public function count(): int
+    {
+        return $this->count;
+    }
+}
@@ -0,0 +1,70 @@
+<?php
+/**
+ * Fixtures for the autodoc directives.
+ */
+namespace Autodoc\Fixture;
+
+use InvalidArgumentException;
+
+/**
+ * Send a greeting.
+ *
+ * @param string $name Who to greet.
+ * @param bool $shout Whether to shout.
+ * @return string The greeting.
+ */
+function greet(string $name, bool $shout = false): string
+{
+    $fn = function ($x) use ($name) { return $x; };
+    return "Hello {$name}";
+}
+
+/**
+ * Something that can be rendered.
+ */
+interface Renderable
+{
+    /**
+     * Render the object.
+     *
+     * @return string
+     */
+    public function render(): string;
+}
+
+/**
+ * Counts things.
+ */
+trait Counts
+{
+    /**
+     * @var int The current count.
+     */
+    protected int $count = 0;
+}
+
+/**
+ * A card suit.
+ */
+enum Suit: string
+{
+    /**
+     * Red hearts.
+     */
+    case Hearts = 'H';
+    case Spades = 'S';
+
+    /**
+     * The suit colour.
+     */
+    public function color(): string
+    {
+        return match ($this) {
+            Suit::Hearts => 'Red',
+            Suit::Spades => 'Black',
+        };
+    }
+}
+
+?>
+<p>Trailing HTML with <?php echo "inline"; ?> code.</p>
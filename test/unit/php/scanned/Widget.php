@@ -0,0 +1,19 @@
+<?php
+namespace Autodoc\Scanned;
+
+/**
+ * A widget found by scanning the source roots.
+ */
+final class Widget
+{
+    /**
+     * Resize the widget.
+     *
+     * @param int $width The new width.
+     * @return static
+     */
+    public function resize(int $width): static
+    {
+        return $this;
+    }
+}
@@ -0,0 +1,10 @@
+<?php
+namespace Autodoc\Scanned\Util;
+
+/**
+ * Clamp a value between two bounds.
+ */
+function clamp(int $value, int $min, int $max): int
+{
+    return max($min, min($max, $value));
+}
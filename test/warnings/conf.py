@@ -0,0 +1,10 @@
+# Builds documentation the PHP domain should warn about, without failing.
+import sys, os
+
+sys.path.append(os.path.abspath(".."))
+
+extensions = ["sphinxcontrib.phpdomain"]
+php_source_roots = ["scanned"]
+master_doc = "index"
+exclude_patterns = ["_build"]
+html_theme = "default"
@@ -0,0 +1,5 @@
+<?php
+
+namespace Broken;
+
+function f($a = [1, 2
\ No newline at end of file
@@ -0,0 +1,7 @@
+<?php
+
+namespace Broken;
+
+enum E
+{
+    case
\ No newline at end of file
@@ -0,0 +1,7 @@
+<?php
+
+namespace Scanned;
+
+class Broken
+{
+    public function f($a = [1, 2
\ No newline at end of file
@@ -0,0 +1,10 @@
+<?php
+
+namespace Scanned;
+
+/**
+ * Scanned although another file of the root is truncated.
+ */
+class Valid
+{
+}